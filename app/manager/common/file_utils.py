@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+各工具管理模块共用的文件操作
+"""
+
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+
+def read_file_version_windows(file_path: str) -> Optional[str]:
+    """读取Windows可执行文件版本资源中的文件版本号
+
+    返回 主版本.次版本.修订号 三段格式（如 8.0.35），与 --version 输出的格式一致；
+    非 Windows 系统或文件没有版本资源时返回 None。
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        version_dll = ctypes.windll.version
+        size = version_dll.GetFileVersionInfoSizeW(file_path, None)
+        if not size:
+            return None
+
+        buffer = ctypes.create_string_buffer(size)
+        if not version_dll.GetFileVersionInfoW(file_path, 0, size, buffer):
+            return None
+
+        # 根块为 VS_FIXEDFILEINFO：签名、结构版本、文件版本高/低 32 位
+        value = ctypes.c_void_p()
+        length = wintypes.UINT()
+        if not version_dll.VerQueryValueW(buffer, "\\", ctypes.byref(value), ctypes.byref(length)):
+            return None
+
+        fixed_info = ctypes.cast(value, ctypes.POINTER(wintypes.DWORD * 4)).contents
+        version_ms, version_ls = fixed_info[2], fixed_info[3]
+        # 第四段为构建号，不属于产品版本
+        return f"{version_ms >> 16}.{version_ms & 0xFFFF}.{version_ls >> 16}"
+    except (AttributeError, OSError):
+        return None
+
+
+def _remove_file(path: str):
+    """删除单个文件，只读文件先去掉只读属性再删除"""
+    try:
+        os.unlink(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+
+def _is_reparse_point(entry: os.DirEntry) -> bool:
+    """是否为 Windows 重解析点（目录联接、目录符号链接等）
+
+    Python 3.12 之前 is_dir(follow_symlinks=False) 对目录联接也返回 True，
+    需检查文件属性才能避免进入联接指向的目录。
+    """
+    if os.name != 'nt':
+        return False
+    attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+    return bool(attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def parallel_rmtree(path: str, workers: int = 8):
+    """多线程删除目录树
+
+    安装目录包含数万个小文件，逐个删除耗时较长。先用 os.scandir 遍历出
+    全部文件和目录，文件交给线程池并行删除，全部完成后再由深到浅删除目录。
+    不跟随符号链接和目录联接，遍历或删除出错时退回 shutil.rmtree 清理剩余内容。
+    """
+    try:
+        files: List[str] = []
+        dirs: List[str] = []
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            dirs.append(current)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        files.append(entry.path)
+                    elif _is_reparse_point(entry):
+                        # 目录联接不进入，与其他目录一起用 os.rmdir 删除联接本身
+                        dirs.append(entry.path)
+                    else:
+                        pending.append(entry.path)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 消费结果以便抛出删除过程中的异常
+            for _ in executor.map(_remove_file, files, chunksize=64):
+                pass
+
+        # 父目录总在子目录（及其中的目录联接）之前加入，倒序即可保证先删子目录
+        for directory in reversed(dirs):
+            os.rmdir(directory)
+    except OSError:
+        def on_error(func, failed_path, exc_info):
+            os.chmod(failed_path, stat.S_IWRITE)
+            func(failed_path)
+
+        shutil.rmtree(path, onerror=on_error)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+各工具页面共用的界面辅助函数
+"""
+
+import functools
+
+from PySide6.QtGui import QFont
+
+
+@functools.lru_cache(maxsize=None)
+def title_font() -> QFont:
+    """标题字体，首次使用时创建（需在 QApplication 之后），各标签页共用"""
+    font = QFont()
+    font.setPointSize(16)
+    font.setBold(True)
+    return font
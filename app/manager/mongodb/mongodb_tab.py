@@ -10,6 +10,7 @@ import sys
 import time
 import json
 import platform
+import subprocess
 from typing import Dict, Any, Optional
 
 from PySide6.QtWidgets import (
@@ -20,12 +21,15 @@ from PySide6.QtWidgets import (
     QComboBox, QSpinBox, QCheckBox, QFrame, QSplitter,
     QScrollArea, QFormLayout, QSlider, QToolTip
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtCore import Qt, QThread, Signal, QTimer, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QFont, QTextCursor, QPixmap, QIcon
 
 from .mongodb_install import MongoDBInstaller
 from .mongodb_config import MongoDBConfigManager
 
+# 服务状态到显示文本的映射，未知状态使用默认值
+_STATUS_TEXT = {"running": "运行中", "stopped": "已停止"}.get
+
 
 class MongoDBWorkerThread(QThread):
     """MongoDB操作工作线程"""
@@ -56,6 +60,8 @@ class MongoDBWorkerThread(QThread):
                 self._restart_service()
             elif self.operation == "get_info":
                 self._get_info()
+            elif self.operation == "full_refresh":
+                self._full_refresh()
             elif self.operation == "test_connection":
                 self._test_connection()
             elif self.operation == "save_config":
@@ -150,6 +156,23 @@ class MongoDBWorkerThread(QThread):
         self.status_updated.emit(info)
         self.finished.emit(True, "获取信息成功")
 
+    def _full_refresh(self):
+        """一次性获取系统要求、服务状态和监控信息"""
+        requirements = self.installer.check_requirements()
+        service_status = self.installer.get_service_status()
+        version = self.installer.get_mongodb_version()
+        installed = self.installer.is_mongodb_installed()
+
+        # 与 get_mongodb_info 返回结构保持一致，避免重复探测
+        self.status_updated.emit({
+            'requirements': requirements,
+            'installed': installed,
+            'version': version,
+            'service_status': service_status,
+            'system': self.installer.system
+        })
+        self.finished.emit(True, "刷新状态成功")
+
     def _test_connection(self):
         """测试MongoDB连接"""
         self.progress.emit("正在测试MongoDB连接...")
@@ -191,14 +214,56 @@ class MongoDBWorkerThread(QThread):
             self.finished.emit(False, str(e))
 
 
+class _WorkerSignals(QObject):
+    """线程池任务的结果信号"""
+    done = Signal(object)
+    failed = Signal(str)
+
+
+class _WorkerTask(QRunnable):
+    """在全局线程池中执行的单个可能耗时的调用"""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        # 信号对象在 GUI 线程创建，结果会以队列方式回到 GUI 线程
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.done.emit(result)
+
+
 class MongoDBTab(QWidget):
     """MongoDB管理标签页"""
 
+    # 数据库列表预分配的行数，超出时按需扩充
+    MAX_DB_ROWS = 16
+
     def __init__(self):
         super().__init__()
         self.installer = MongoDBInstaller()
         self.config_manager = MongoDBConfigManager()
         self.worker_thread = None
+        self.refresh_thread = None
+        self._refresh_pending = False
+        self._pending_tasks = set()
+
+        # 监控页不可见时跳过更新，记录最近一次数据，显示时再应用
+        self._monitor_stale = False
+        self._last_monitor_info = None
+
+        # 日志缓冲：同一事件循环周期内的多条日志合并为一次插入
+        self._pending_logs = {}
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+
         self.init_ui()
         self.refresh_status()
 
@@ -225,8 +290,33 @@ class MongoDBTab(QWidget):
         self.monitor_tab = self.create_monitor_tab()
         self.tab_widget.addTab(self.monitor_tab, "监控信息")
 
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+
         layout.addWidget(self.tab_widget)
 
+    def showEvent(self, event):
+        """标签页重新显示时补做被跳过的监控刷新"""
+        super().showEvent(event)
+        QTimer.singleShot(0, self._refresh_monitor_if_stale)
+
+    def _on_tab_changed(self, index: int):
+        """切换到监控页时补做被跳过的监控刷新"""
+        if self.tab_widget.widget(index) is self.monitor_tab:
+            self._refresh_monitor_if_stale()
+
+    def _refresh_monitor_if_stale(self):
+        """监控页可见且数据过期时刷新
+
+        隐藏期间收到但未显示的数据直接显示，被跳过的刷新则重新获取。
+        """
+        if not self._monitor_stale or not self.monitor_tab.isVisible():
+            return
+
+        if self._last_monitor_info is not None:
+            self.update_monitor_info(self._last_monitor_info)
+        else:
+            self.refresh_monitor_info()
+
     def create_install_tab(self) -> QWidget:
         """创建安装管理标签页"""
         widget = QWidget()
@@ -317,9 +407,6 @@ class MongoDBTab(QWidget):
         log_layout.addWidget(self.install_log)
         layout.addWidget(log_group)
 
-        # 初始化检查
-        self.check_requirements()
-
         return widget
 
     def create_service_tab(self) -> QWidget:
@@ -603,6 +690,10 @@ MongoDB配置说明:
         self.database_table.setAlternatingRowColors(True)
         self.database_table.setSelectionBehavior(QTableWidget.SelectRows)
 
+        # 预先创建表格项，刷新时只更新文本
+        self._db_items = []
+        self._ensure_db_rows(self.MAX_DB_ROWS)
+
         db_layout.addWidget(self.database_table)
         layout.addWidget(db_group)
 
@@ -623,9 +714,6 @@ MongoDB配置说明:
 
         layout.addStretch()
 
-        # 初始加载
-        self.refresh_monitor_info()
-
         return widget
 
     def browse_install_path(self):
@@ -636,11 +724,36 @@ MongoDB配置说明:
         if path:
             self.install_path_edit.setText(path)
 
+    def _run_on_worker(self, fn, on_done, on_error=None):
+        """将可能阻塞的安装器调用提交到全局线程池，完成后在 GUI 线程回调"""
+        task = _WorkerTask(fn)
+        self._pending_tasks.add(task)
+
+        def finish(callback, value):
+            self._pending_tasks.discard(task)
+            if callback:
+                callback(value)
+
+        task.signals.done.connect(lambda result: finish(on_done, result))
+        task.signals.failed.connect(lambda message: finish(on_error, message))
+        QThreadPool.globalInstance().start(task)
+
     def check_requirements(self):
         """检查系统要求"""
-        requirements = self.installer.check_requirements()
+        self.check_req_btn.setEnabled(False)
+
+        def on_done(requirements):
+            self.check_req_btn.setEnabled(True)
+            self.update_requirements(requirements)
+
+        def on_error(message):
+            self.check_req_btn.setEnabled(True)
+            self.install_status_label.setText(f"✗ 检查系统要求失败: {message}")
 
-        # 更新界面显示
+        self._run_on_worker(self.installer.check_requirements, on_done, on_error)
+
+    def update_requirements(self, requirements: dict):
+        """更新系统要求显示"""
         if requirements.get('internet', False):
             self.internet_label.setText("✓ 可用")
         else:
@@ -983,6 +1096,12 @@ MongoDB配置说明:
 
     def refresh_monitor_info(self):
         """刷新监控信息"""
+        if not self.monitor_tab.isVisible():
+            # 跳过的是重新获取，缓存的监控数据已过期，显示时需重新获取
+            self._last_monitor_info = None
+            self._monitor_stale = True
+            return
+
         if self.worker_thread and self.worker_thread.isRunning():
             return
 
@@ -993,6 +1112,12 @@ MongoDB配置说明:
 
     def update_monitor_info(self, info: dict):
         """更新监控信息"""
+        self._last_monitor_info = info
+        if not self.monitor_tab.isVisible():
+            self._monitor_stale = True
+            return
+        self._monitor_stale = False
+
         # 更新基本信息
         installed = info.get('installed', False)
         version = info.get('version', '未知')
@@ -1003,11 +1128,7 @@ MongoDB配置说明:
         self.monitor_version_label.setText(version if version else "未安装")
 
         if installed:
-            self.monitor_status_label.setText(
-                "运行中" if status == "running" else
-                "已停止" if status == "stopped" else
-                "未知"
-            )
+            self.monitor_status_label.setText(_STATUS_TEXT(status, "未知"))
         else:
             self.monitor_status_label.setText("未安装")
 
@@ -1050,47 +1171,91 @@ MongoDB配置说明:
             ("test", "50 MB", "12", "1500"),
         ]
 
-        self.database_table.setRowCount(len(databases))
+        self._ensure_db_rows(len(databases))
+
+        for row, values in enumerate(databases):
+            for item, value in zip(self._db_items[row], values):
+                item.setText(value)
 
-        for row, (name, size, collections, documents) in enumerate(databases):
-            self.database_table.setItem(row, 0, QTableWidgetItem(name))
-            self.database_table.setItem(row, 1, QTableWidgetItem(size))
-            self.database_table.setItem(row, 2, QTableWidgetItem(collections))
-            self.database_table.setItem(row, 3, QTableWidgetItem(documents))
+        # 隐藏多余的预分配行（缩小行数会销毁已缓存的表格项）
+        for row in range(len(self._db_items)):
+            self.database_table.setRowHidden(row, row >= len(databases))
+
+    def _ensure_db_rows(self, count: int):
+        """确保数据库列表至少有 count 行预分配的表格项"""
+        current = len(self._db_items)
+        if count <= current:
+            return
+
+        self.database_table.setRowCount(count)
+        column_count = self.database_table.columnCount()
+        for row in range(current, count):
+            items = [QTableWidgetItem() for _ in range(column_count)]
+            for column, item in enumerate(items):
+                self.database_table.setItem(row, column, item)
+            self.database_table.setRowHidden(row, True)
+            self._db_items.append(items)
 
     def open_mongo_shell(self):
         """打开MongoDB Shell"""
+        # 推迟到下一轮事件循环再启动进程，让按钮点击立即返回
+        QTimer.singleShot(0, self._launch_mongo_shell)
+
+    def _launch_mongo_shell(self):
+        """启动mongosh进程（不经过shell解析）"""
         try:
-            import subprocess
-            subprocess.Popen(['mongosh'], shell=True)
+            subprocess.Popen(
+                ['mongosh'],
+                creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == 'win32' else 0,
+                start_new_session=True
+            )
         except Exception as e:
             QMessageBox.warning(self, "错误", f"无法打开MongoDB Shell：{str(e)}")
 
     def refresh_status(self):
-        """刷新所有状态信息"""
+        """刷新所有状态信息（单个工作线程完成全部探测）"""
+        if self.refresh_thread and self.refresh_thread.isRunning():
+            # 正在刷新时记录一次待刷新，结束后再执行，避免显示过期状态
+            self._refresh_pending = True
+            return
+
+        self._refresh_pending = False
+        self.refresh_thread = MongoDBWorkerThread("full_refresh", self.installer)
+        self.refresh_thread.status_updated.connect(self.on_full_refresh)
+        self.refresh_thread.finished.connect(self.on_full_refresh_finished)
+        self.refresh_thread.start()
+
+    def on_full_refresh(self, info: dict):
+        """分发刷新结果到各标签页"""
         # 刷新安装状态
-        self.check_requirements()
+        self.update_requirements(info.get('requirements', {}))
 
         # 刷新服务状态
-        self._refresh_service_status()
+        self._refresh_service_status(info)
 
         # 刷新监控信息
-        self.refresh_monitor_info()
+        self.update_monitor_info(info)
+
+    def on_full_refresh_finished(self, success: bool, message: str):
+        """刷新完成处理"""
+        if not success:
+            self.service_status_label.setText("获取状态失败")
+
+        if self._refresh_pending:
+            # finished 是 run() 的最后一步，等待线程真正退出后再发起下一次刷新
+            self.refresh_thread.wait()
+            self.refresh_status()
 
-    def _refresh_service_status(self):
+    def _refresh_service_status(self, info: dict):
         """刷新服务状态"""
         try:
-            status = self.installer.get_service_status()
-            version = self.installer.get_mongodb_version()
-            installed = self.installer.is_mongodb_installed()
+            status = info.get('service_status', {})
+            version = info.get('version')
+            installed = info.get('installed', False)
 
             # 更新服务标签页状态
             status_text = status.get('status', 'unknown')
-            self.service_status_label.setText(
-                "运行中" if status_text == "running" else
-                "已停止" if status_text == "stopped" else
-                "未知"
-            )
+            self.service_status_label.setText(_STATUS_TEXT(status_text, "未知"))
 
             
             self.service_version_label.setText(version if version else "未安装")
@@ -1119,14 +1284,25 @@ MongoDB配置说明:
 
     def append_install_log(self, message: str):
         """添加安装日志"""
-        self.install_log.append(f"[{time.strftime('%H:%M:%S')}] {message}")
-        cursor = self.install_log.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.install_log.setTextCursor(cursor)
+        self._queue_log(self.install_log, message)
 
     def append_service_log(self, message: str):
         """添加服务日志"""
-        self.service_log.append(f"[{time.strftime('%H:%M:%S')}] {message}")
-        cursor = self.service_log.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.service_log.setTextCursor(cursor)
\ No newline at end of file
+        self._queue_log(self.service_log, message)
+
+    def _queue_log(self, log_widget: QTextEdit, message: str):
+        """缓冲日志行，等待定时器统一写入"""
+        self._pending_logs.setdefault(log_widget, []).append(
+            f"[{time.strftime('%H:%M:%S')}] {message}\n"
+        )
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_logs(self):
+        """将缓冲的日志一次性插入到文本末尾"""
+        for log_widget, lines in self._pending_logs.items():
+            cursor = log_widget.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText("".join(lines))
+            log_widget.setTextCursor(cursor)
+        self._pending_logs.clear()
\ No newline at end of file
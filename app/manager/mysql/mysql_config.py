@@ -5,12 +5,15 @@ MySQL 配置管理模块
 提供 MySQL 配置文件的读取、修改和管理功能
 """
 
+import io
 import os
 import sys
 import json
 import shutil
 import configparser
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 
@@ -22,6 +25,9 @@ class MySQLConfigManager:
         """初始化配置管理器"""
         self.default_paths = self._get_default_mysql_paths()
         self.config_files = self._get_config_files()
+        # edit_config 上下文中正在编辑的配置数据及最近一次写入结果
+        self._editing_config = None
+        self.last_write_ok = False
 
     def _get_default_mysql_paths(self) -> Dict[str, str]:
         """获取默认的MySQL安装路径"""
@@ -82,7 +88,7 @@ class MySQLConfigManager:
             config_files.extend([
                 '/etc/mysql/my.cnf',
                 '/etc/my.cnf',
-                '~/.my.cnf'
+                os.path.expanduser('~/.my.cnf')
             ])
 
         return [f for f in config_files if f and os.path.exists(f)]
@@ -156,6 +162,16 @@ class MySQLConfigManager:
             print(f"读取配置文件失败: {e}")
             return None
 
+    def read_all_configs(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """并行读取所有已知配置文件，返回 {文件路径: 配置数据}"""
+        if not self.config_files:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(self.config_files)) as executor:
+            results = executor.map(self.read_config, self.config_files)
+
+        return dict(zip(self.config_files, results))
+
     def write_config(self, config_data: Dict[str, Any], config_file: str = None) -> bool:
         """写入MySQL配置文件"""
         if not config_file:
@@ -166,12 +182,6 @@ class MySQLConfigManager:
             return False
 
         try:
-            # 备份原配置文件
-            backup_file = config_file + '.backup'
-            if os.path.exists(config_file):
-                shutil.copy2(config_file, backup_file)
-                print(f"已备份原配置文件到: {backup_file}")
-
             config = configparser.ConfigParser()
 
             for section_name, section_data in config_data.items():
@@ -179,9 +189,116 @@ class MySQLConfigManager:
                 for key, value in section_data.items():
                     config.set(section_name, key, str(value))
 
-            with open(config_file, 'w', encoding='utf-8') as f:
-                config.write(f)
+            buffer = io.StringIO()
+            config.write(buffer)
+            self._save_config_text(config_file, buffer.getvalue())
+
+            print(f"配置文件已更新: {config_file}")
+            return True
+
+        except Exception as e:
+            print(f"写入配置文件失败: {e}")
+            return False
+
+    def _save_config_text(self, config_file: str, content: str):
+        """备份并替换配置文件内容"""
+        # my.cnf 常为指向 /etc/mysql/... 的符号链接，替换其真实文件以保留链接
+        config_file = os.path.realpath(config_file)
+
+        # 备份原配置文件
+        backup_file = config_file + '.backup'
+        if os.path.exists(config_file):
+            self._backup_file(config_file, backup_file)
+            print(f"已备份原配置文件到: {backup_file}")
+
+        # 写入临时文件后整体替换，备份若为硬链接仍指向旧内容（原地写入的回退分支除外）
+        temp_file = config_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if os.path.exists(config_file):
+            shutil.copymode(config_file, temp_file)
+            st = os.stat(config_file)
+            if hasattr(os, 'chown') and (st.st_uid, st.st_gid) != (os.getuid(), os.getgid()):
+                try:
+                    # 沿用原属主（如 mysql 用户），避免以 root 写入后服务无法读取
+                    os.chown(temp_file, st.st_uid, st.st_gid)
+                except PermissionError:
+                    # 无权修改属主时原地覆盖写入；备份若是同一 inode 的硬链接会被一起改写，
+                    # 先换成独立副本
+                    if os.path.exists(backup_file) and os.path.samefile(backup_file, config_file):
+                        shutil.copy2(config_file, backup_file + '.tmp')
+                        os.replace(backup_file + '.tmp', backup_file)
+                    shutil.copyfile(temp_file, config_file)
+                    os.remove(temp_file)
+                    return
+        os.replace(temp_file, config_file)
+
+    def _patch_ini_inplace(self, config_file: str,
+                           section_updates: Dict[str, Dict[str, str]]) -> bool:
+        """逐行修改配置文件中的指定键，保留注释和原有顺序
+
+        已存在的键原位替换，缺失的键追加到对应节末尾，缺失的节追加到文件末尾。
+        """
+        def normalize(key: str) -> str:
+            # MySQL 中 '-' 与 '_' 等价，configparser 读取时键名转为小写
+            return key.strip().lower().replace('-', '_')
 
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+
+            if lines and not lines[-1].endswith('\n'):
+                lines[-1] += '\n'
+
+            updates = {
+                section: {normalize(k): (k, str(v)) for k, v in values.items()}
+                for section, values in section_updates.items()
+            }
+            written = {section: set() for section in updates}
+            output = []
+            current = None
+            # 当前节最后一个键值行（无键时为节头）之后的位置
+            section_end = 0
+
+            def append_missing(section, insert_at):
+                if section not in updates:
+                    return
+                missing = [key for key in updates[section] if key not in written[section]]
+                if not missing:
+                    return
+                # 插入到该节最后一个键值行之后，不放到节末尾的 !include 指令或注释之后，
+                # 否则被包含的文件可能覆盖新增的值
+                output[insert_at:insert_at] = [
+                    f"{updates[section][key][0]} = {updates[section][key][1]}\n"
+                    for key in missing
+                ]
+                written[section].update(missing)
+
+            for line in lines:
+                stripped = line.strip()
+                if stripped.startswith('[') and stripped.endswith(']'):
+                    append_missing(current, section_end)
+                    current = stripped[1:-1].strip()
+                elif current in updates and stripped and stripped[0] not in '#;!':
+                    key = normalize(stripped.split('=', 1)[0])
+                    if key in updates[current]:
+                        name, value = updates[current][key]
+                        line = f"{name} = {value}\n"
+                        written[current].add(key)
+                output.append(line)
+                # 节头和键值行推进插入位置，空行、注释和 ! 指令不推进
+                if stripped and stripped[0] not in '#;!':
+                    section_end = len(output)
+            append_missing(current, section_end)
+
+            for section in updates:
+                if section not in written or not written[section]:
+                    if output and output[-1].strip():
+                        output.append('\n')
+                    output.append(f"[{section}]\n")
+                    append_missing(section, len(output))
+
+            self._save_config_text(config_file, ''.join(output))
             print(f"配置文件已更新: {config_file}")
             return True
 
@@ -189,6 +306,73 @@ class MySQLConfigManager:
             print(f"写入配置文件失败: {e}")
             return False
 
+    def _apply_section_updates(self, section_updates: Dict[str, Dict[str, str]]) -> bool:
+        """应用按节组织的配置修改"""
+        # 处于 edit_config 中时只修改内存数据，由外层统一写回
+        if self._editing_config is not None:
+            for section, values in section_updates.items():
+                self._editing_config.setdefault(section, {}).update(values)
+            return True
+
+        config_file = self.config_files[0] if self.config_files else None
+        if config_file and os.path.exists(config_file):
+            return self._patch_ini_inplace(config_file, section_updates)
+
+        # 配置文件不存在时回退到 ConfigParser 完整写入
+        with self.edit_config() as config_data:
+            for section, values in section_updates.items():
+                config_data.setdefault(section, {}).update(values)
+
+        return self.last_write_ok
+
+    def _backup_file(self, source: str, backup: str):
+        """备份文件：优先 reflink / 硬链接，避免复制数据"""
+        if os.path.lexists(backup):
+            os.remove(backup)
+
+        # Linux 下 btrfs/xfs 等支持 FICLONE，写时复制，O(1)
+        if sys.platform.startswith('linux'):
+            try:
+                import fcntl
+                FICLONE = 0x40049409
+                with open(source, 'rb') as src, open(backup, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, backup)
+                return
+            except (OSError, ImportError):
+                if os.path.exists(backup):
+                    os.remove(backup)
+
+        # 同一文件系统下硬链接，配置写入采用替换方式，不会影响备份内容
+        try:
+            os.link(source, backup)
+            return
+        except (OSError, AttributeError):
+            pass
+
+        shutil.copy2(source, backup)
+
+    @contextmanager
+    def edit_config(self, config_file: str = None):
+        """批量修改配置：进入时读取一次，退出时写入一次
+
+        嵌套调用时复用外层的配置数据，由最外层统一写回，
+        写入结果保存在 last_write_ok 中。
+        """
+        if self._editing_config is not None:
+            yield self._editing_config
+            self.last_write_ok = True
+            return
+
+        config_data = self.read_config(config_file) or {}
+        self._editing_config = config_data
+        try:
+            yield config_data
+        finally:
+            self._editing_config = None
+
+        self.last_write_ok = self.write_config(config_data, config_file)
+
     def get_current_config(self) -> Dict[str, Any]:
         """获取当前MySQL配置"""
         config_info = {
@@ -231,35 +415,19 @@ class MySQLConfigManager:
     def update_basic_config(self, port: int = 3306, max_connections: int = 151,
                            innodb_buffer: str = '128M') -> bool:
         """更新基本配置参数"""
-        config_data = self.read_config() or {}
-
-        # 确保 [mysqld] 节存在
-        if 'mysqld' not in config_data:
-            config_data['mysqld'] = {}
-
-        # 更新配置
-        config_data['mysqld'].update({
-            'port': str(port),
-            'max_connections': str(max_connections),
-            'innodb_buffer_pool_size': innodb_buffer
+        return self._apply_section_updates({
+            'mysqld': {
+                'port': str(port),
+                'max_connections': str(max_connections),
+                'innodb_buffer_pool_size': innodb_buffer
+            },
+            'client': {
+                'port': str(port)
+            }
         })
 
-        # 确保 [client] 节存在
-        if 'client' not in config_data:
-            config_data['client'] = {}
-
-        config_data['client']['port'] = str(port)
-
-        return self.write_config(config_data)
-
     def add_performance_config(self) -> bool:
         """添加性能优化配置"""
-        config_data = self.read_config() or {}
-
-        # 确保 [mysqld] 节存在
-        if 'mysqld' not in config_data:
-            config_data['mysqld'] = {}
-
         # 性能优化配置
         performance_config = {
             # 缓冲区设置
@@ -292,17 +460,10 @@ class MySQLConfigManager:
             'innodb_file_per_table': '1'
         }
 
-        config_data['mysqld'].update(performance_config)
-
-        return self.write_config(config_data)
+        return self._apply_section_updates({'mysqld': performance_config})
 
     def add_security_config(self) -> bool:
         """添加安全配置"""
-        config_data = self.read_config() or {}
-
-        if 'mysqld' not in config_data:
-            config_data['mysqld'] = {}
-
         # 安全配置
         security_config = {
             'local_infile': '0',  # 禁用 LOAD DATA LOCAL INFILE
@@ -318,9 +479,7 @@ class MySQLConfigManager:
             'log_queries_not_using_indexes': '1'
         }
 
-        config_data['mysqld'].update(security_config)
-
-        return self.write_config(config_data)
+        return self._apply_section_updates({'mysqld': security_config})
 
     def validate_config(self) -> Dict[str, Any]:
         """验证配置文件"""
@@ -7,19 +7,115 @@ MySQL 安装和服务管理脚本
 
 import os
 import sys
+import json
 import time
+import logging
+import functools
+import importlib
 import shutil
+import struct
 import subprocess
 import platform
-import requests
+import re
 import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple, Any
 
+try:
+    from ..common.file_utils import parallel_rmtree, read_file_version_windows
+except ImportError:
+    # 作为独立脚本运行时没有上级包，将项目根目录加入搜索路径
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from app.manager.common.file_utils import parallel_rmtree, read_file_version_windows
+
+try:
+    # ISA-L 提供 SIMD 加速的 Deflate 实现，接口与 zlib 一致，未安装时使用标准库
+    from isal import isal_zlib as inflate_zlib
+except ImportError:
+    inflate_zlib = zlib
+
+logger = logging.getLogger(__name__)
+
+
+class _LazyModule:
+    """首次访问属性时才导入的模块代理，避免只查询状态时也付出导入开销"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+requests = _LazyModule("requests")
+zipfile = _LazyModule("zipfile")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_win32service():
+    """导入 pywin32 服务模块，导入结果（包括失败）只计算一次"""
+    try:
+        import win32service
+        import win32con
+    except ImportError:
+        return None
+    return win32service, win32con
+
 
 class MySQLInstaller:
     """MySQL 安装器和服务管理器"""
 
+    # sc query 输出中的服务状态行，例如 "STATE : 4  RUNNING"
+    _SC_STATE_PATTERN = re.compile(r"STATE\s+:\s+\d+\s+(\w+)")
+    _SC_STATE_MAP = {
+        "RUNNING": "running",
+        "STOPPED": "stopped",
+        "START_PENDING": "starting",
+        "STOP_PENDING": "stopping",
+        "CONTINUE_PENDING": "resuming",
+        "PAUSE_PENDING": "pausing",
+        "PAUSED": "paused"
+    }
+
+    # Windows my.ini 模板，类加载时构建一次
+    _MYINI_TEMPLATE = """[mysqld]
+# 设置3306端口
+port=3306
+
+# 设置mysql的安装目录
+basedir={basedir}
+
+# 设置mysql数据库的数据的存放目录
+datadir={basedir}\\data
+
+# 允许最大连接数
+max_connections=200
+
+# 服务端使用的字符集默认为utf8mb4
+character-set-server=utf8mb4
+
+# 创建新表时将使用的默认存储引擎
+default-storage-engine=INNODB
+
+# 默认使用"mysql_native_password"插件认证
+default_authentication_plugin=mysql_native_password
+
+[mysql]
+# 设置mysql客户端默认字符集
+default-character-set=utf8mb4
+
+[client]
+# 设置mysql客户端连接服务端时默认使用的端口
+port=3306
+default-character-set=utf8mb4
+"""
+
     def __init__(self):
         """初始化安装器"""
         self.system = platform.system().lower()
@@ -27,6 +123,159 @@ class MySQLInstaller:
         self.mysql_version = "8.0.35"
         self.installation_path = self._get_default_installation_path()
         self.service_name = "MySQL80" if self.system == "windows" else "mysql"
+        self._requirements_cache = None
+        self._version_cache = None
+        self._session = None
+        # Unix 下只探测一次可用的服务管理方式
+        self._svc_mgr = self._detect_service_manager() if self.system != "windows" else None
+        # systemd D-Bus 连接在首次操作服务时建立
+        self._systemd_bus = None
+        self._systemd = None
+        self._systemd_checked = False
+        # D-Bus 连接不是线程安全的，界面和后台任务可能同时访问，所有调用需持锁
+        self._systemd_lock = threading.Lock()
+
+    @property
+    def _http(self) -> "requests.Session":
+        """首次使用时创建的HTTP会话"""
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> "requests.Session":
+        """创建复用连接的HTTP会话，检查网络和下载共用同一连接池"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """关闭HTTP会话和 systemd 连接"""
+        session = getattr(self, '_session', None)
+        if session is not None:
+            session.close()
+            self._session = None
+
+        bus = getattr(self, '_systemd_bus', None)
+        if bus is not None:
+            with self._systemd_lock:
+                bus.close()
+                self._systemd_bus = None
+                self._systemd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def _detect_service_manager(self) -> str:
+        """检测Unix系统可用的服务管理命令"""
+        if shutil.which("systemctl"):
+            return "systemctl"
+        if shutil.which("service"):
+            return "service"
+        return "/etc/init.d/mysql"
+
+    def _connect_systemd(self):
+        """建立到 systemd 的持久 D-Bus 连接，不可用时返回 (None, None)"""
+        if self._svc_mgr != "systemctl":
+            return None, None
+
+        try:
+            # 通过 D-Bus 直接与 systemd 通信，可选依赖
+            from pystemd.dbuslib import DBus
+            from pystemd.systemd1 import Manager as SystemdManager
+        except ImportError:
+            return None, None
+
+        try:
+            bus = DBus()
+            bus.open()
+            manager = SystemdManager(bus=bus)
+            manager.load()
+            return bus, manager
+        except Exception:
+            return None, None
+
+    def _systemd_manager(self):
+        """首次调用时建立 systemd 连接，不可用时返回 None；调用方需持有 _systemd_lock"""
+        if not self._systemd_checked:
+            self._systemd_checked = True
+            self._systemd_bus, self._systemd = self._connect_systemd()
+        return self._systemd
+
+    def _systemd_unit_state(self) -> Optional[Tuple[int, bytes]]:
+        """通过 D-Bus 读取单元的 (排队作业 ID, ActiveState)，不可用或读取失败时返回 None"""
+        with self._systemd_lock:
+            if self._systemd_manager() is None:
+                return None
+            try:
+                from pystemd.systemd1 import Unit as SystemdUnit
+                unit = SystemdUnit(self._systemd_unit_name(), bus=self._systemd_bus)
+                unit.load()
+                return unit.Unit.Job[0], unit.Unit.ActiveState
+            except Exception:
+                return None
+
+    def _systemd_run_job(self, method: str, target_states: Tuple[bytes, ...],
+                         timeout: float = 60) -> Optional[bool]:
+        """通过 D-Bus 提交启动/停止作业，并像 systemctl 一样等待作业完成
+
+        StartUnit/StopUnit 只把作业加入队列后立即返回，这里每 0.2 秒检查一次
+        单元上是否还有排队的作业，作业结束后以 ActiveState 判断是否成功。
+
+        Returns:
+            是否到达目标状态；D-Bus 不可用或提交作业失败时返回 None，由调用方回退到命令
+        """
+        with self._systemd_lock:
+            manager = self._systemd_manager()
+            if manager is None:
+                return None
+            try:
+                getattr(manager.Manager, method)(self._systemd_unit_name(), b"replace")
+            except Exception:
+                # 权限不足等情况
+                return None
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            state = self._systemd_unit_state()
+            if state is None:
+                return False
+            job_id, active_state = state
+            if not job_id:
+                return active_state in target_states
+            time.sleep(0.2)
+        return False
+
+    def _systemd_unit_name(self) -> bytes:
+        """systemd 单元名"""
+        return f"{self.service_name}.service".encode()
+
+    def _service_command(self, action: str) -> List[str]:
+        """构建Unix服务操作命令，root 用户不再经过 sudo"""
+        if self._svc_mgr == "systemctl":
+            cmd = ["systemctl", action, self.service_name]
+        elif self._svc_mgr == "service":
+            cmd = ["service", self.service_name, action]
+        else:
+            cmd = [self._svc_mgr, action]
+
+        if os.geteuid() != 0:
+            cmd.insert(0, "sudo")
+        return cmd
 
     def _get_default_installation_path(self) -> str:
         """获取默认安装路径"""
@@ -35,38 +284,59 @@ class MySQLInstaller:
         else:
             return "/opt/mysql"
 
-    def check_requirements(self) -> Dict[str, bool]:
-        """检查安装要求"""
-        requirements = {
-            'internet': self._check_internet_connection(),
-            'disk_space': self._check_disk_space(1024),  # 1GB
-            'admin_privileges': self._check_admin_privileges(),
-            'visual_cpp': True if self.system != "windows" else self._check_visual_cpp(),
+    def check_requirements(self, refresh: bool = False) -> Dict[str, bool]:
+        """检查安装要求
+
+        各项检查相互独立，并发执行；结果缓存在实例上，refresh=True 时重新检查。
+        """
+        if self._requirements_cache is not None and not refresh:
+            return dict(self._requirements_cache)
+
+        probes = {
+            'internet': self._check_internet_connection,
+            'disk_space': lambda: self._check_disk_space(1024),  # 1GB
+            'admin_privileges': self._check_admin_privileges,
+            'visual_cpp': (lambda: True) if self.system != "windows" else self._check_visual_cpp,
         }
 
-        return requirements
+        requirements = {}
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            futures = {executor.submit(self._timed_probe, name, probe): name
+                       for name, probe in probes.items()}
+            for future in as_completed(futures):
+                requirements[futures[future]] = future.result()
+
+        # 保持与检查项定义一致的顺序
+        requirements = {name: requirements[name] for name in probes}
+        self._requirements_cache = requirements
+        return dict(requirements)
+
+    def _timed_probe(self, name: str, probe) -> bool:
+        """执行单项检查并记录耗时，便于定位慢检查"""
+        start = time.perf_counter()
+        try:
+            return probe()
+        finally:
+            logger.debug("probe %s %.1fms", name, (time.perf_counter() - start) * 1e3)
 
     def _check_internet_connection(self) -> bool:
         """检查网络连接"""
+        start = time.perf_counter()
         try:
-            response = requests.get("https://www.mysql.com", timeout=5)
-            return response.status_code == 200
-        except:
+            # HEAD 请求不下载页面内容
+            response = self._http.head("https://www.mysql.com", timeout=2)
+            return response.status_code < 400
+        except requests.RequestException as e:
+            logger.debug("网络检查失败 (%.1fms): %s", (time.perf_counter() - start) * 1e3, e)
             return False
 
     def _check_disk_space(self, required_mb: int) -> bool:
         """检查磁盘空间"""
         try:
-            if self.system == "windows":
-                import psutil
-                disk_usage = psutil.disk_usage("C:\\")
-                free_space_mb = disk_usage.free / (1024 * 1024)
-            else:
-                stat = os.statvfs("/")
-                free_space_mb = (stat.f_bavail * stat.f_frsize) / (1024 * 1024)
-
-            return free_space_mb >= required_mb
-        except:
+            free = shutil.disk_usage("C:\\" if self.system == "windows" else "/").free
+            return free >= required_mb * 1024 * 1024
+        except OSError as e:
+            logger.debug("磁盘空间检查失败: %s", e)
             return True  # 假设有足够空间
 
     def _check_admin_privileges(self) -> bool:
@@ -75,7 +345,8 @@ class MySQLInstaller:
             try:
                 import ctypes
                 return ctypes.windll.shell32.IsUserAnAdmin() != 0
-            except:
+            except (AttributeError, OSError) as e:
+                logger.debug("管理员权限检查失败: %s", e)
                 return False
         else:
             return os.geteuid() == 0
@@ -87,7 +358,8 @@ class MySQLInstaller:
             with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
                                r"SOFTWARE\Microsoft\VisualStudio\14.0\VC\Runtimes\x64") as key:
                 return True
-        except:
+        except (ImportError, OSError) as e:
+            logger.debug("Visual C++ 检查失败: %s", e)
             # 可以通过其他方式检查或直接提示用户安装
             return True
 
@@ -106,23 +378,18 @@ class MySQLInstaller:
         """下载Windows版MySQL"""
         print("正在下载MySQL for Windows...")
 
-        # MySQL 8.0 Windows x64 ZIP下载链接
-        download_url = f"https://dev.mysql.com/get/Downloads/MySQL-{self.mysql_version.split('.')[0]}.{self.mysql_version.split('.')[1]}/mysql-{self.mysql_version}-winx64.zip"
+        download_url = self._get_windows_download_url()
 
         try:
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
+            with self._http.get(download_url, stream=True) as response:
+                response.raise_for_status()
 
-            # 保存到临时目录
-            temp_dir = tempfile.gettempdir()
-            filename = f"mysql-{self.mysql_version}-winx64.zip"
-            filepath = os.path.join(temp_dir, filename)
+                # 保存到临时目录
+                filepath = self._get_windows_download_path()
 
-            print(f"正在下载到: {filepath}")
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                print(f"正在下载到: {filepath}")
+                with open(filepath, 'wb') as f:
+                    self._save_response(response, f)
 
             print("下载完成")
             return filepath
@@ -131,6 +398,211 @@ class MySQLInstaller:
             print(f"下载失败: {e}")
             return None
 
+    def _get_windows_download_url(self) -> str:
+        """获取Windows版MySQL ZIP下载链接"""
+        # MySQL 8.0 Windows x64 ZIP下载链接
+        major, minor = self.mysql_version.split('.')[:2]
+        return f"https://dev.mysql.com/get/Downloads/MySQL-{major}.{minor}/mysql-{self.mysql_version}-winx64.zip"
+
+    def _save_response(self, response, f, on_progress=None):
+        """将下载响应直接拷贝到文件，on_progress 接收每次写入的字节数"""
+        # 只有服务器声明了压缩编码时才解码，否则直接拷贝原始字节
+        encoding = response.headers.get('Content-Encoding', '').lower()
+        response.raw.decode_content = encoding in ('gzip', 'deflate')
+
+        # 未解码时 Content-Length 即文件大小，一次性预分配
+        if not response.raw.decode_content:
+            self._preallocate_file(f, int(response.headers.get('Content-Length', 0) or 0))
+
+        while True:
+            chunk = response.raw.read(1024 * 1024)
+            if not chunk:
+                break
+            f.write(chunk)
+            if on_progress:
+                on_progress(len(chunk))
+
+        # 实际长度与声明不一致时截断预分配的多余部分
+        f.truncate()
+
+    def _preallocate_file(self, f, size: int):
+        """按最终大小预分配文件空间，减少扩展元数据更新和碎片"""
+        if size <= 0:
+            return
+
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(f.fileno(), 0, size)
+            else:
+                # Windows 下扩展文件结尾（SetEndOfFile）
+                f.truncate(size)
+                self._set_file_valid_data(f, size)
+        except OSError:
+            pass
+
+    def _set_file_valid_data(self, f, size: int):
+        """在具有 SE_MANAGE_VOLUME 权限时跳过预分配区域的清零"""
+        try:
+            import ctypes
+            import msvcrt
+            handle = msvcrt.get_osfhandle(f.fileno())
+            ctypes.windll.kernel32.SetFileValidData(ctypes.c_void_p(handle), ctypes.c_longlong(size))
+        except (ImportError, AttributeError, OSError):
+            pass
+
+    def _get_windows_download_path(self) -> str:
+        """获取Windows版MySQL ZIP的本地保存路径"""
+        return os.path.join(tempfile.gettempdir(), f"mysql-{self.mysql_version}-winx64.zip")
+
+    def download_and_install_windows(self) -> bool:
+        """边下载边解压安装Windows版MySQL
+
+        下载在后台线程进行，主线程按本地文件头顺序解压已完整下载的条目；
+        下载完成后再通过中央目录并行解压剩余条目。
+        """
+        print("正在下载并安装MySQL for Windows...")
+        self._version_cache = None
+
+        if self._is_already_extracted():
+            print("MySQL已解压到安装目录，跳过下载和解压")
+            return self._setup_mysql_windows()
+
+        download_url = self._get_windows_download_url()
+        filepath = self._get_windows_download_path()
+        extract_path = os.path.dirname(self.installation_path)
+        download_done = threading.Event()
+        download_errors = []
+        # 已写入的字节数（文件已预分配，不能用文件大小判断下载进度）
+        downloaded = [0]
+
+        def on_progress(size):
+            downloaded[0] += size
+
+        def download():
+            try:
+                with self._http.get(download_url, stream=True) as response:
+                    response.raise_for_status()
+                    # 无缓冲写入，解压线程能立即看到已下载的数据
+                    with open(filepath, 'wb', buffering=0) as f:
+                        self._save_response(response, f, on_progress)
+            except Exception as e:
+                download_errors.append(e)
+            finally:
+                download_done.set()
+
+        # 先创建空文件，保证解压线程打开时文件已存在
+        open(filepath, 'wb').close()
+        print(f"正在下载到: {filepath}")
+        download_thread = threading.Thread(target=download, daemon=True)
+        download_thread.start()
+
+        try:
+            extracted = self._extract_while_downloading(
+                filepath, extract_path, download_done, lambda: downloaded[0]
+            )
+            download_thread.join()
+
+            if download_errors:
+                print(f"下载失败: {download_errors[0]}")
+                return False
+
+            print("下载完成，正在解压剩余文件...")
+            self._parallel_extract(filepath, extract_path, skip=extracted)
+
+            return self._setup_mysql_windows()
+
+        except Exception as e:
+            print(f"安装过程中出错: {e}")
+            return False
+
+    def _extract_while_downloading(self, zip_path: str, extract_path: str,
+                                   download_done: threading.Event, get_available) -> set:
+        """在下载过程中按本地文件头顺序解压已经完整到达的条目
+
+        遇到无法流式处理的条目（数据描述符、加密、ZIP64、未知压缩方式）即停止，
+        剩余条目留给下载完成后的中央目录解压。get_available 返回已下载的字节数。
+        返回已解压的条目名集合。
+        """
+        header_size = 30
+        extract_root = os.path.abspath(extract_path)
+        extracted = set()
+        offset = 0
+
+        # 文件已按最终大小预分配，未下载部分是零；必须无缓冲读取，
+        # 否则缓冲区会保留读到的零字节，之后在缓冲范围内 seek 会读到过期数据
+        with open(zip_path, 'rb', buffering=0) as f:
+            while True:
+                finished = download_done.is_set()
+                available = get_available()
+
+                if offset + header_size > available:
+                    if finished:
+                        break
+                    download_done.wait(0.05)
+                    continue
+
+                f.seek(offset)
+                (signature, _, flags, method, _, _, crc, compressed_size,
+                 _, name_len, extra_len) = struct.unpack('<IHHHHHIIIHH', f.read(header_size))
+
+                # 已到达中央目录，或条目无法流式解压
+                if (signature != 0x04034b50 or flags & 0x09 or method not in (0, 8)
+                        or compressed_size == 0xFFFFFFFF):
+                    break
+
+                data_start = offset + header_size + name_len + extra_len
+                entry_end = data_start + compressed_size
+                if entry_end > available:
+                    if finished:
+                        break
+                    download_done.wait(0.05)
+                    continue
+
+                raw_name = f.read(name_len)
+                name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+                target = self._zip_member_path(extract_root, name)
+                if target is None:
+                    break
+
+                if name.endswith('/'):
+                    os.makedirs(target, exist_ok=True)
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    f.seek(data_start)
+                    if not self._inflate_member(f, compressed_size, method, crc, target):
+                        break
+
+                extracted.add(name)
+                offset = entry_end
+
+        return extracted
+
+    def _inflate_member(self, src, compressed_size: int, method: int,
+                        expected_crc: int, target: str) -> bool:
+        """从当前位置解压单个ZIP条目到目标文件，CRC 校验失败时删除并返回 False"""
+        decompressor = inflate_zlib.decompressobj(-15) if method == 8 else None
+        remaining = compressed_size
+        crc = 0
+
+        with open(target, 'wb') as dst:
+            while remaining:
+                chunk = src.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                data = decompressor.decompress(chunk) if decompressor else chunk
+                crc = inflate_zlib.crc32(data, crc)
+                dst.write(data)
+            if decompressor:
+                data = decompressor.flush()
+                crc = inflate_zlib.crc32(data, crc)
+                dst.write(data)
+
+        if remaining or crc != expected_crc:
+            os.remove(target)
+            return False
+        return True
+
     def _download_mysql_linux(self) -> Optional[str]:
         """下载Linux版MySQL"""
         print("正在下载MySQL for Linux...")
@@ -159,6 +631,7 @@ class MySQLInstaller:
 
     def install_mysql(self, installer_path: str = None) -> bool:
         """安装MySQL"""
+        self._version_cache = None
         try:
             if self.system == "windows":
                 return self._install_mysql_windows(installer_path)
@@ -177,6 +650,10 @@ class MySQLInstaller:
         """安装Windows版MySQL"""
         print("正在安装MySQL for Windows...")
 
+        if self._is_already_extracted():
+            print("MySQL已解压到安装目录，跳过解压")
+            return self._setup_mysql_windows()
+
         if not installer_path:
             print("错误: 未指定安装包路径")
             return False
@@ -186,10 +663,16 @@ class MySQLInstaller:
         extract_path = os.path.dirname(self.installation_path)
 
         try:
-            import zipfile
-            with zipfile.ZipFile(installer_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_path)
+            self._parallel_extract(installer_path, extract_path)
+            return self._setup_mysql_windows()
 
+        except Exception as e:
+            print(f"安装过程中出错: {e}")
+            return False
+
+    def _setup_mysql_windows(self) -> bool:
+        """解压完成后的配置、初始化和服务安装"""
+        try:
             # 创建数据目录
             data_dir = os.path.join(self.installation_path, "data")
             os.makedirs(data_dir, exist_ok=True)
@@ -203,6 +686,8 @@ class MySQLInstaller:
             # 安装服务
             self._install_service_windows()
 
+            self._write_installed_marker()
+
             print("MySQL安装完成")
             return True
 
@@ -210,43 +695,122 @@ class MySQLInstaller:
             print(f"安装过程中出错: {e}")
             return False
 
-    def _create_config_file_windows(self):
-        """创建Windows配置文件"""
-        config_content = f"""[mysqld]
-# 设置3306端口
-port=3306
+    def _get_installed_marker_path(self) -> str:
+        """安装完成标记文件路径"""
+        return os.path.join(self.installation_path, ".installed")
 
-# 设置mysql的安装目录
-basedir={self.installation_path}
-
-# 设置mysql数据库的数据的存放目录
-datadir={self.installation_path}\\data
-
-# 允许最大连接数
-max_connections=200
+    def _is_already_extracted(self) -> bool:
+        """根据标记文件判断当前版本是否已完整解压到安装目录"""
+        mysqld_path = Path(self.installation_path) / "bin" / "mysqld.exe"
+        try:
+            with open(self._get_installed_marker_path(), 'r', encoding='utf-8') as f:
+                marker = json.load(f)
+            mysqld_size = mysqld_path.stat().st_size
+        except (OSError, ValueError):
+            return False
 
-# 服务端使用的字符集默认为utf8mb4
-character-set-server=utf8mb4
+        return (marker.get('version') == self.mysql_version
+                and marker.get('mysqld_size') == mysqld_size)
 
-# 创建新表时将使用的默认存储引擎
-default-storage-engine=INNODB
+    def _write_installed_marker(self):
+        """安装成功后原子写入标记文件"""
+        mysqld_path = Path(self.installation_path) / "bin" / "mysqld.exe"
+        marker = {
+            'version': self.mysql_version,
+            'mysqld_size': mysqld_path.stat().st_size
+        }
 
-# 默认使用"mysql_native_password"插件认证
-default_authentication_plugin=mysql_native_password
+        marker_path = self._get_installed_marker_path()
+        temp_path = marker_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+        os.replace(temp_path, marker_path)
+
+    def _parallel_extract(self, zip_path: str, extract_path: str, skip: set = None):
+        """多线程解压ZIP安装包
+
+        ZIP 中每个条目都是独立的压缩流，可以并行解压。
+        目录先串行创建，文件再分发到线程池，每个线程使用独立的文件句柄，
+        直接定位到条目数据解压（可使用 ISA-L 加速）。skip 中的条目视为已解压，直接跳过。
+        """
+        extract_root = os.path.abspath(extract_path)
+        skip = skip or set()
+        files = []
+
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.filename in skip:
+                    continue
+                target = self._zip_member_path(extract_root, info.filename)
+                if target is None:
+                    # 路径不安全的条目交给 zipfile 自行处理
+                    zip_ref.extract(info, extract_root)
+                elif info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    files.append((info, target))
+
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def thread_handle(name, opener):
+            handle = getattr(local, name, None)
+            if handle is None:
+                handle = opener()
+                setattr(local, name, handle)
+                with handles_lock:
+                    handles.append(handle)
+            return handle
+
+        def extract_member(item):
+            info, target = item
+            if info.flag_bits & 0x01 or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                # 加密或其他压缩方式的条目交给 zipfile 处理
+                zip_file = thread_handle('zip_file', lambda: zipfile.ZipFile(zip_path, 'r'))
+                with zip_file.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            else:
+                archive = thread_handle('archive', lambda: open(zip_path, 'rb'))
+                archive.seek(info.header_offset)
+                name_len, extra_len = struct.unpack('<HH', archive.read(30)[26:30])
+                archive.seek(info.header_offset + 30 + name_len + extra_len)
+                if not self._inflate_member(archive, info.compress_size, info.compress_type,
+                                            info.CRC, target):
+                    raise zipfile.BadZipFile(f"CRC 校验失败: {info.filename}")
+
+            # 保留 Unix 权限位
+            mode = (info.external_attr >> 16) & 0o7777
+            if mode:
+                os.chmod(target, mode)
 
-[mysql]
-# 设置mysql客户端默认字符集
-default-character-set=utf8mb4
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                for _ in executor.map(extract_member, files):
+                    pass
+        finally:
+            for handle in handles:
+                handle.close()
+
+    def _zip_member_path(self, extract_root: str, member_name: str) -> Optional[str]:
+        """计算ZIP条目的解压路径，路径越界时返回 None"""
+        target = os.path.normpath(os.path.join(extract_root, member_name))
+        if os.path.isabs(member_name) or os.path.commonpath([extract_root, target]) != extract_root:
+            return None
+        return target
 
-[client]
-# 设置mysql客户端连接服务端时默认使用的端口
-port=3306
-default-character-set=utf8mb4
-"""
+    def _create_config_file_windows(self):
+        """创建Windows配置文件"""
+        content = self._MYINI_TEMPLATE.format(basedir=self.installation_path)
 
         config_file = os.path.join(self.installation_path, "my.ini")
-        with open(config_file, 'w', encoding='utf-8') as f:
-            f.write(config_content)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(config_file, flags, 0o644)
+        try:
+            os.write(fd, content.encode('utf-8'))
+        finally:
+            os.close(fd)
 
     def _initialize_data_directory(self):
         """初始化数据目录"""
@@ -298,6 +862,7 @@ default-character-set=utf8mb4
 
     def uninstall_mysql(self) -> bool:
         """卸载MySQL"""
+        self._version_cache = None
         try:
             if self.system == "windows":
                 return self._uninstall_mysql_windows()
@@ -319,7 +884,8 @@ default-character-set=utf8mb4
         # 删除安装目录
         if os.path.exists(self.installation_path):
             try:
-                shutil.rmtree(self.installation_path)
+                # 用 mklink /J 迁移出去的数据目录只删除联接本身，不删除其指向的内容
+                parallel_rmtree(self.installation_path, workers=min(32, (os.cpu_count() or 1) * 4))
                 print(f"已删除安装目录: {self.installation_path}")
             except Exception as e:
                 print(f"删除安装目录失败: {e}")
@@ -390,19 +956,22 @@ default-character-set=utf8mb4
 
     def _start_service_unix(self) -> bool:
         """启动Unix服务"""
-        commands = [
-            ["sudo", "systemctl", "start", "mysql"],
-            ["sudo", "service", "mysql", "start"],
-            ["sudo", "/etc/init.d/mysql", "start"]
-        ]
-
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+        if self._svc_mgr == "systemctl":
+            started = self._systemd_run_job("StartUnit", (b"active",))
+            if started:
                 print("MySQL服务启动成功")
                 return True
+            if started is not None:
+                print("启动服务失败: 服务未能进入运行状态")
+                return False
+            # D-Bus 不可用或权限不足时回退到 systemctl 命令
+
+        result = subprocess.run(self._service_command("start"), capture_output=True, text=True)
+        if result.returncode == 0:
+            print("MySQL服务启动成功")
+            return True
 
-        print("启动服务失败")
+        print(f"启动服务失败: {result.stderr}")
         return False
 
     def stop_service(self) -> bool:
@@ -430,19 +999,22 @@ default-character-set=utf8mb4
 
     def _stop_service_unix(self) -> bool:
         """停止Unix服务"""
-        commands = [
-            ["sudo", "systemctl", "stop", "mysql"],
-            ["sudo", "service", "mysql", "stop"],
-            ["sudo", "/etc/init.d/mysql", "stop"]
-        ]
-
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+        if self._svc_mgr == "systemctl":
+            stopped = self._systemd_run_job("StopUnit", (b"inactive", b"failed"))
+            if stopped:
                 print("MySQL服务停止成功")
                 return True
+            if stopped is not None:
+                print("停止服务失败: 服务未能停止")
+                return False
+            # D-Bus 不可用或权限不足时回退到 systemctl 命令
+
+        result = subprocess.run(self._service_command("stop"), capture_output=True, text=True)
+        if result.returncode == 0:
+            print("MySQL服务停止成功")
+            return True
 
-        print("停止服务失败")
+        print(f"停止服务失败: {result.stderr}")
         return False
 
     def restart_service(self) -> bool:
@@ -465,9 +1037,12 @@ default-character-set=utf8mb4
 
     def _get_service_status_windows(self) -> Dict[str, Any]:
         """获取Windows服务状态"""
+        modules = _load_win32service()
+        if modules is None:
+            return self._get_service_status_sc()
+
         try:
-            import win32service
-            import win32con
+            win32service, win32con = modules
 
             scm = win32service.OpenSCManager(None, None, win32con.GENERIC_READ)
             service = win32service.OpenService(scm, self.service_name, win32con.GENERIC_READ)
@@ -488,36 +1063,53 @@ default-character-set=utf8mb4
                 "service_name": self.service_name
             }
 
-        except ImportError:
-            # 使用sc命令作为备选方案
-            cmd = ["sc", "query", self.service_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if "RUNNING" in result.stdout:
-                return {"status": "running", "service_name": self.service_name}
-            elif "STOPPED" in result.stdout:
-                return {"status": "stopped", "service_name": self.service_name}
-            else:
-                return {"status": "unknown", "message": result.stderr}
-
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _get_service_status_sc(self) -> Dict[str, Any]:
+        """使用sc命令获取Windows服务状态（未安装 pywin32 时的备选方案）"""
+        cmd = ["sc", "query", self.service_name]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        match = self._SC_STATE_PATTERN.search(result.stdout)
+        if match and match.group(1) in self._SC_STATE_MAP:
+            return {"status": self._SC_STATE_MAP[match.group(1)], "service_name": self.service_name}
+        return {"status": "unknown", "message": result.stderr}
+
     def _get_service_status_unix(self) -> Dict[str, Any]:
         """获取Unix服务状态"""
-        commands = [
-            ["sudo", "systemctl", "status", "mysql"],
-            ["sudo", "service", "mysql", "status"],
-            ["sudo", "/etc/init.d/mysql", "status"]
-        ]
-
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode in [0, 3]:  # 0=running, 3=stopped
-                if "active (running)" in result.stdout:
+        if self._svc_mgr == "systemctl":
+            unit_state = self._systemd_unit_state()
+            if unit_state is not None:
+                state = unit_state[1]
+                if state == b"active":
                     return {"status": "running"}
-                elif "inactive (dead)" in result.stdout or "stopped" in result.stdout:
+                elif state in (b"inactive", b"failed"):
                     return {"status": "stopped"}
+                elif state == b"activating":
+                    return {"status": "starting"}
+                elif state == b"deactivating":
+                    return {"status": "stopping"}
+                return {"status": "unknown"}
+
+
+            # 状态由退出码给出，无需读取和解析输出，也不需要 sudo
+            result = subprocess.run(
+                ["systemctl", "is-active", "--quiet", self.service_name],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            if result.returncode == 0:
+                return {"status": "running"}
+            elif result.returncode == 3:
+                return {"status": "stopped"}
+            return {"status": "unknown"}
+
+        result = subprocess.run(self._service_command("status"), capture_output=True, text=True)
+        if result.returncode in [0, 3]:  # 0=running, 3=stopped
+            if "active (running)" in result.stdout:
+                return {"status": "running"}
+            elif "inactive (dead)" in result.stdout or "stopped" in result.stdout:
+                return {"status": "stopped"}
 
         return {"status": "unknown"}
 
@@ -540,22 +1132,33 @@ default-character-set=utf8mb4
                 return False
 
     def get_mysql_version(self) -> Optional[str]:
-        """获取MySQL版本"""
+        """获取MySQL版本，结果缓存在实例上"""
+        if self._version_cache is None:
+            self._version_cache = self._query_mysql_version()
+        return self._version_cache
+
+    def _query_mysql_version(self) -> Optional[str]:
+        """查询MySQL版本"""
         try:
             if self.system == "windows":
                 mysql_path = os.path.join(self.installation_path, "bin", "mysql.exe")
                 if os.path.exists(mysql_path):
+                    # 优先读取可执行文件的版本资源，避免启动子进程
+                    version = read_file_version_windows(mysql_path)
+                    if version:
+                        return version
+
                     result = subprocess.run([mysql_path, "--version"],
-                                          capture_output=True, text=True)
+                                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
                     if result.returncode == 0:
-                        return result.stdout.split()[4]  # 提取版本号
+                        return result.stdout.split(maxsplit=5)[4].decode('ascii')  # 提取版本号
             else:
                 result = subprocess.run(["mysql", "--version"],
-                                      capture_output=True, text=True)
+                                      stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
                 if result.returncode == 0:
-                    return result.stdout.split()[4]  # 提取版本号
-        except:
-            pass
+                    return result.stdout.split(maxsplit=5)[4].decode('ascii')  # 提取版本号
+        except (OSError, IndexError, ValueError) as e:
+            logger.debug("获取MySQL版本失败: %s", e)
 
         return None
 
@@ -620,11 +1223,8 @@ def main():
             requirements = installer.check_requirements()
             if all(requirements.values()):
                 if installer.system == "windows":
-                    installer_path = installer.download_mysql()
-                    if installer_path:
-                        installer.install_mysql(installer_path)
-                    else:
-                        print("下载失败，请手动下载并安装")
+                    if not installer.download_and_install_windows():
+                        print("下载安装失败，请手动下载并安装")
                 else:
                     print("请使用系统包管理器安装MySQL")
             else:
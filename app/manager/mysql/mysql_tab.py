@@ -5,196 +5,268 @@ MySQL 管理标签页
 提供 MySQL 安装、配置、服务管理的图形界面
 """
 
-import sys
 import os
-import subprocess
+import shutil
+import time
+from collections import deque
 from typing import Optional, Dict, Any
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QGroupBox, QLabel, QLineEdit, QPushButton, QTextEdit,
-    QProgressBar, QTabWidget, QTableWidget, QTableWidgetItem,
+    QGroupBox, QLabel, QLineEdit, QPushButton, QPlainTextEdit,
+    QProgressBar, QTabWidget, QTableView,
     QHeaderView, QMessageBox, QFileDialog, QComboBox,
     QSpinBox, QCheckBox, QFrame, QScrollArea
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Signal, QTimer, QUrl
+)
+from PySide6.QtGui import QDesktopServices, QFont, QTextCursor
 
 from .mysql_installer import MySQLInstaller
 from .mysql_config import MySQLConfigManager
 
 
-class MySQLWorkerThread(QThread):
-    """MySQL操作工作线程"""
-    log_signal = Signal(str)
-    progress_signal = Signal(int)
-    finished_signal = Signal(bool, str)
+class MySQLWorkerSignals(QObject):
+    """MySQL后台任务信号（QRunnable 不是 QObject，信号放在单独的对象上）"""
+    log = Signal(str)
+    progress = Signal(int)
+    finished = Signal(bool, str)
+
+
+class MySQLJob(QRunnable):
+    """在线程池中执行的MySQL操作任务"""
+
+    # 操作名到处理方法的映射；元组表示直接调用安装器方法的简单操作：
+    # (安装器方法名, 开始提示, 成功提示, 失败提示)
+    _OPS = {
+        "install": "_install_mysql",
+        "uninstall": ("uninstall_mysql", "开始卸载MySQL...", "MySQL卸载成功", "MySQL卸载失败"),
+        "start_service": ("start_service", "正在启动MySQL服务...", "MySQL服务启动成功", "MySQL服务启动失败"),
+        "stop_service": ("stop_service", "正在停止MySQL服务...", "MySQL服务停止成功", "MySQL服务停止失败"),
+        "restart_service": ("restart_service", "正在重启MySQL服务...", "MySQL服务重启成功", "MySQL服务重启失败"),
+        "install_service": ("install_service", "正在安装MySQL服务...", "MySQL服务安装成功", "MySQL服务安装失败"),
+        "set_password": "_set_password",
+        "check_requirements": "_check_requirements",
+    }
 
     def __init__(self, operation: str, installer: MySQLInstaller, **kwargs):
         super().__init__()
+        self.signals = MySQLWorkerSignals()
         self.operation = operation
         self.installer = installer
         self.kwargs = kwargs
 
     def run(self):
         """执行操作"""
+        entry = self._OPS.get(self.operation)
+        if entry is None:
+            self.signals.finished.emit(False, f"未知操作: {self.operation}")
+            return
+
         try:
-            if self.operation == "install":
-                self._install_mysql()
-            elif self.operation == "uninstall":
-                self._uninstall_mysql()
-            elif self.operation == "start_service":
-                self._start_service()
-            elif self.operation == "stop_service":
-                self._stop_service()
-            elif self.operation == "restart_service":
-                self._restart_service()
-            elif self.operation == "install_service":
-                self._install_service()
-            elif self.operation == "set_password":
-                self._set_password()
-            elif self.operation == "check_requirements":
-                self._check_requirements()
+            if isinstance(entry, tuple):
+                self._run_simple(*entry)
             else:
-                self.finished_signal.emit(False, f"未知操作: {self.operation}")
-
+                getattr(self, entry)()
         except Exception as e:
-            self.log_signal.emit(f"操作失败: {str(e)}")
-            self.finished_signal.emit(False, str(e))
+            self.signals.log.emit(f"操作失败: {str(e)}")
+            self.signals.finished.emit(False, str(e))
 
     def _install_mysql(self):
         """安装MySQL"""
-        self.log_signal.emit("开始安装MySQL...")
-        self.progress_signal.emit(10)
+        self.signals.log.emit("开始安装MySQL...")
+        self.signals.progress.emit(10)
 
         # 检查安装要求
         requirements = self.installer.check_requirements()
-        self.log_signal.emit("检查安装要求...")
-        self.progress_signal.emit(20)
+        self.signals.log.emit("检查安装要求...")
+        self.signals.progress.emit(20)
 
         failed_requirements = [req for req, satisfied in requirements.items() if not satisfied]
         if failed_requirements:
             error_msg = f"不满足安装要求: {', '.join(failed_requirements)}"
-            self.log_signal.emit(error_msg)
-            self.finished_signal.emit(False, error_msg)
+            self.signals.log.emit(error_msg)
+            self.signals.finished.emit(False, error_msg)
             return
 
-        self.log_signal.emit("安装要求检查通过")
-        self.progress_signal.emit(30)
+        self.signals.log.emit("安装要求检查通过")
+        self.signals.progress.emit(30)
 
         if self.installer.system == "windows":
-            # 下载MySQL
-            self.log_signal.emit("正在下载MySQL...")
-            installer_path = self.installer.download_mysql()
-            self.progress_signal.emit(50)
-
-            if not installer_path:
-                error_msg = "下载MySQL失败"
-                self.log_signal.emit(error_msg)
-                self.finished_signal.emit(False, error_msg)
-                return
-
-            # 安装MySQL
-            self.log_signal.emit("正在安装MySQL...")
-            success = self.installer.install_mysql(installer_path)
-            self.progress_signal.emit(80)
+            # 下载与解压流水线执行
+            self.signals.log.emit("正在下载并安装MySQL...")
+            success = self.installer.download_and_install_windows()
+            self.signals.progress.emit(80)
 
             if success:
-                self.log_signal.emit("MySQL安装成功")
-                self.finished_signal.emit(True, "MySQL安装成功")
+                self.signals.log.emit("MySQL安装成功")
+                self.signals.finished.emit(True, "MySQL安装成功")
             else:
                 error_msg = "MySQL安装失败"
-                self.log_signal.emit(error_msg)
-                self.finished_signal.emit(False, error_msg)
+                self.signals.log.emit(error_msg)
+                self.signals.finished.emit(False, error_msg)
         else:
-            self.log_signal.emit("请使用系统包管理器安装MySQL")
-            self.finished_signal.emit(False, "请使用系统包管理器安装MySQL")
+            self.signals.log.emit("请使用系统包管理器安装MySQL")
+            self.signals.finished.emit(False, "请使用系统包管理器安装MySQL")
 
-        self.progress_signal.emit(100)
+        self.signals.progress.emit(100)
 
-    def _uninstall_mysql(self):
-        """卸载MySQL"""
-        self.log_signal.emit("开始卸载MySQL...")
-        success = self.installer.uninstall_mysql()
+    def _run_simple(self, method_name: str, start_msg: str, ok_msg: str, fail_msg: str):
+        """调用安装器方法并报告结果"""
+        self.signals.log.emit(start_msg)
+        success = getattr(self.installer, method_name)()
 
-        if success:
-            self.log_signal.emit("MySQL卸载成功")
-            self.finished_signal.emit(True, "MySQL卸载成功")
-        else:
-            self.log_signal.emit("MySQL卸载失败")
-            self.finished_signal.emit(False, "MySQL卸载失败")
+        message = ok_msg if success else fail_msg
+        self.signals.log.emit(message)
+        self.signals.finished.emit(success, message)
 
-    def _start_service(self):
-        """启动服务"""
-        self.log_signal.emit("正在启动MySQL服务...")
-        success = self.installer.start_service()
+    def _set_password(self):
+        """设置密码"""
+        password = self.kwargs.get('password', '')
+        self.signals.log.emit("正在设置root密码...")
+        success = self.installer.set_root_password(password)
 
         if success:
-            self.log_signal.emit("MySQL服务启动成功")
-            self.finished_signal.emit(True, "MySQL服务启动成功")
+            self.signals.log.emit("root密码设置成功")
+            self.signals.finished.emit(True, "root密码设置成功")
         else:
-            self.log_signal.emit("MySQL服务启动失败")
-            self.finished_signal.emit(False, "MySQL服务启动失败")
+            self.signals.log.emit("root密码设置失败")
+            self.signals.finished.emit(False, "root密码设置失败")
 
-    def _stop_service(self):
-        """停止服务"""
-        self.log_signal.emit("正在停止MySQL服务...")
-        success = self.installer.stop_service()
+    def _check_requirements(self):
+        """检查安装要求"""
+        self.signals.log.emit("检查安装要求...")
+        # 用户主动检查时忽略缓存
+        requirements = self.installer.check_requirements(refresh=True)
 
-        if success:
-            self.log_signal.emit("MySQL服务停止成功")
-            self.finished_signal.emit(True, "MySQL服务停止成功")
-        else:
-            self.log_signal.emit("MySQL服务停止失败")
-            self.finished_signal.emit(False, "MySQL服务停止失败")
+        # 各项结果合并为一条日志发送
+        self.signals.log.emit("\n".join(
+            f"  {'✓' if satisfied else '✗'} {req}" for req, satisfied in requirements.items()
+        ))
 
-    def _restart_service(self):
-        """重启服务"""
-        self.log_signal.emit("正在重启MySQL服务...")
-        success = self.installer.restart_service()
+        self.signals.finished.emit(True, "安装要求检查完成")
 
-        if success:
-            self.log_signal.emit("MySQL服务重启成功")
-            self.finished_signal.emit(True, "MySQL服务重启成功")
-        else:
-            self.log_signal.emit("MySQL服务重启失败")
-            self.finished_signal.emit(False, "MySQL服务重启失败")
 
-    def _install_service(self):
-        """安装服务"""
-        self.log_signal.emit("正在安装MySQL服务...")
-        success = self.installer.install_service()
+def _path_mtime(path: Optional[str]) -> int:
+    """返回路径的修改时间（纳秒），不存在时返回 -1"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return -1
 
-        if success:
-            self.log_signal.emit("MySQL服务安装成功")
-            self.finished_signal.emit(True, "MySQL服务安装成功")
-        else:
-            self.log_signal.emit("MySQL服务安装失败")
-            self.finished_signal.emit(False, "MySQL服务安装失败")
 
-    def _set_password(self):
-        """设置密码"""
-        password = self.kwargs.get('password', '')
-        self.log_signal.emit("正在设置root密码...")
-        success = self.installer.set_root_password(password)
+class MySQLStatusProbe(QObject):
+    """后台状态探测，在线程池中收集安装、服务和配置状态"""
+    status_ready = Signal(dict)
 
-        if success:
-            self.log_signal.emit("root密码设置成功")
-            self.finished_signal.emit(True, "root密码设置成功")
-        else:
-            self.log_signal.emit("root密码设置失败")
-            self.finished_signal.emit(False, "root密码设置失败")
+    def __init__(self, installer: MySQLInstaller, config_manager: MySQLConfigManager, parent=None):
+        super().__init__(parent)
+        self.installer = installer
+        self.config_manager = config_manager
+        self._running = False
+        self._pending = False
+        # 安装状态按安装目录与 mysql 可执行文件位置缓存，配置按配置文件 mtime 缓存
+        self._install_key = None
+        self._install_info = None
+        self._config_key = None
+        self._config_info = None
+        self._stale = True
+        self.status_ready.connect(self._on_ready)
+
+    def request(self):
+        """请求一次状态刷新，上一次探测未完成时合并为一次"""
+        if self._running:
+            self._pending = True
+            return
+        self._running = True
+        QThreadPool.globalInstance().start(self._probe)
 
-    def _check_requirements(self):
-        """检查安装要求"""
-        self.log_signal.emit("检查安装要求...")
-        requirements = self.installer.check_requirements()
+    def invalidate(self):
+        """丢弃缓存，下次探测重新查询安装状态和配置"""
+        self._stale = True
 
-        for req, satisfied in requirements.items():
-            status = "✓" if satisfied else "✗"
-            self.log_signal.emit(f"  {status} {req}")
+    def _probe(self):
+        """在工作线程中执行探测"""
+        try:
+            info = self._collect()
+        except Exception as e:
+            info = {"error": str(e)}
+        self.status_ready.emit(info)
+
+    def _collect(self) -> Dict[str, Any]:
+        """收集状态信息"""
+        stale, self._stale = self._stale, False
+
+        install_key = (_path_mtime(self.installer.installation_path), shutil.which("mysql"))
+        if stale or install_key != self._install_key:
+            installed = self.installer.is_mysql_installed()
+            version = self.installer.get_mysql_version() if installed else None
+            self._install_info = (installed, version)
+            self._install_key = install_key
+
+        config_key = tuple(_path_mtime(f) for f in self.config_manager.config_files)
+        if stale or config_key != self._config_key:
+            self._config_info = self.config_manager.get_config_summary()
+            self._config_key = config_key
+
+        installed, version = self._install_info
+        return {
+            "installed": installed,
+            "version": version,
+            "service_status": self.installer.get_service_status(),
+            "config_summary": self._config_info,
+        }
+
+    def _on_ready(self, info: dict):
+        """探测完成，处理合并的刷新请求"""
+        self._running = False
+        if self._pending:
+            self._pending = False
+            self.request()
+
+
+class MySQLHistoryModel(QAbstractTableModel):
+    """状态历史表格模型，最多保留固定条数的记录（环形缓冲）"""
+    HEADERS = ("时间", "状态", "连接数", "查询数")
+
+    def __init__(self, max_rows: int = 100, parent=None):
+        super().__init__(parent)
+        self._rows = deque(maxlen=max_rows)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append(self, record: tuple):
+        """追加一条记录，缓冲区已满时丢弃最早的一条"""
+        count = len(self._rows)
+        if count < self._rows.maxlen:
+            self.beginInsertRows(QModelIndex(), count, count)
+            self._rows.append(record)
+            self.endInsertRows()
+        else:
+            # 行数不变，整体上移一行，只需一次 dataChanged
+            self._rows.append(record)
+            self.dataChanged.emit(self.index(0, 0), self.index(count - 1, len(self.HEADERS) - 1))
 
-        self.finished_signal.emit(True, "安装要求检查完成")
+    def clear(self):
+        """清空所有记录"""
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
 
 
 class MySQLTab(QWidget):
@@ -204,9 +276,27 @@ class MySQLTab(QWidget):
         super().__init__()
         self.installer = MySQLInstaller()
         self.config_manager = MySQLConfigManager()
-        self.worker_thread = None
+        # 单线程池串行执行所有操作，避免每次点击都新建 QThread
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._busy = False
+        self._job = None
+        self.status_probe = MySQLStatusProbe(self.installer, self.config_manager, self)
+        self.status_probe.status_ready.connect(self._apply_status)
+        self._last_status = None
+        # 历史记录在监控页创建前也要积累
+        self._history_model = MySQLHistoryModel(100, self)
+        # 确认对话框按用途缓存，重复确认时复用
+        self._confirm_boxes = {}
+
+        # 日志缓冲，定时批量写入文本框
+        self._pending_logs = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+
         self.init_ui()
-        self.refresh_status()
 
     def init_ui(self):
         """初始化界面"""
@@ -222,22 +312,63 @@ class MySQLTab(QWidget):
         self.install_tab = self._create_install_tab()
         self.tab_widget.addTab(self.install_tab, "安装管理")
 
-        # 服务管理标签页
-        self.service_tab = self._create_service_tab()
-        self.tab_widget.addTab(self.service_tab, "服务管理")
+        # 其余标签页先放占位控件，首次切换到时再创建
+        self._tab_builders = {
+            1: ("service_tab", self._create_service_tab, "服务管理"),
+            2: ("config_tab", self._create_config_tab, "配置管理"),
+            3: ("monitor_tab", self._create_monitor_tab, "状态监控"),
+        }
+        for index in sorted(self._tab_builders):
+            self.tab_widget.addTab(QWidget(), self._tab_builders[index][2])
+        self.tab_widget.currentChanged.connect(self._lazy_build_tab)
+
+        # 定时刷新状态，只在页面可见时运行；安装、启停等操作完成后会主动刷新
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(15000)  # 每15秒刷新一次
+        self.status_timer.timeout.connect(self.refresh_status)
+        self._polling_enabled = True
 
-        # 配置管理标签页
-        self.config_tab = self._create_config_tab()
-        self.tab_widget.addTab(self.config_tab, "配置管理")
+    def showEvent(self, event):
+        """页面显示时刷新状态并开始定时刷新"""
+        super().showEvent(event)
+        self.refresh_status()
+        if self._polling_enabled:
+            self.status_timer.start()
+
+    def hideEvent(self, event):
+        """页面隐藏时停止定时刷新"""
+        super().hideEvent(event)
+        self.status_timer.stop()
+
+    def _update_polling(self, installed: bool, status_text: str):
+        """未安装且服务状态未知时停止轮询，等操作完成后再恢复"""
+        self._polling_enabled = installed or status_text != 'unknown'
+        if not self._polling_enabled:
+            self.status_timer.stop()
+        elif self.isVisible() and not self.status_timer.isActive():
+            self.status_timer.start()
+
+    def _lazy_build_tab(self, index: int):
+        """首次切换到标签页时创建其内容，替换占位控件"""
+        entry = self._tab_builders.pop(index, None)
+        if entry is None:
+            return
 
-        # 状态监控标签页
-        self.monitor_tab = self._create_monitor_tab()
-        self.tab_widget.addTab(self.monitor_tab, "状态监控")
+        attr, builder, title = entry
+        widget = builder()
+        setattr(self, attr, widget)
 
-        # 设置定时刷新状态
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.refresh_status)
-        self.status_timer.start(5000)  # 每5秒刷新一次
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, widget, title)
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+
+        # 新建的控件补上最近一次的状态
+        if self._last_status is not None:
+            self._update_status_widgets(self._last_status)
 
     def _create_install_tab(self) -> QWidget:
         """创建安装管理标签页"""
@@ -271,7 +402,7 @@ class MySQLTab(QWidget):
         requirements_group = QGroupBox("安装要求检查")
         requirements_layout = QVBoxLayout(requirements_group)
 
-        self.requirements_text = QTextEdit()
+        self.requirements_text = QPlainTextEdit()
         self.requirements_text.setMaximumHeight(100)
         self.requirements_text.setReadOnly(True)
         requirements_layout.addWidget(self.requirements_text)
@@ -307,8 +438,9 @@ class MySQLTab(QWidget):
         log_group = QGroupBox("操作日志")
         log_layout = QVBoxLayout(log_group)
 
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(2000)
         log_layout.addWidget(self.log_text)
 
         layout.addWidget(log_group)
@@ -451,7 +583,7 @@ class MySQLTab(QWidget):
         config_info_group = QGroupBox("配置文件信息")
         config_info_layout = QVBoxLayout(config_info_group)
 
-        self.config_info_text = QTextEdit()
+        self.config_info_text = QPlainTextEdit()
         self.config_info_text.setMaximumHeight(150)
         self.config_info_text.setReadOnly(True)
         config_info_layout.addWidget(self.config_info_text)
@@ -493,9 +625,11 @@ class MySQLTab(QWidget):
         history_group = QGroupBox("状态历史")
         history_layout = QVBoxLayout(history_group)
 
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
-        self.history_table.setHorizontalHeaderLabels(["时间", "状态", "连接数", "查询数"])
+        self.history_table = QTableView()
+        self.history_table.setModel(self._history_model)
+        # 追加记录时不排序，行高固定，避免每次插入都重新计算布局
+        self.history_table.setSortingEnabled(False)
+        self.history_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.history_table.horizontalHeader().setStretchLastSection(True)
         history_layout.addWidget(self.history_table)
 
@@ -510,104 +644,41 @@ class MySQLTab(QWidget):
 
     def check_requirements(self):
         """检查安装要求"""
-        if self.worker_thread and self.worker_thread.isRunning():
+        if self._busy:
             return
 
         self.requirements_text.clear()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-
-        self.worker_thread = MySQLWorkerThread("check_requirements", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.progress_signal.connect(self.progress_bar.setValue)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("check_requirements", show_progress=True)
 
     def install_mysql(self):
         """安装MySQL"""
-        reply = QMessageBox.question(
-            self, "确认安装", "确定要安装MySQL吗？\n这将下载并安装MySQL数据库。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-
-        if reply != QMessageBox.Yes:
+        if not self._confirm("install", "确认安装", "确定要安装MySQL吗？\n这将下载并安装MySQL数据库。"):
             return
 
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.log_text.clear()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-
-        self.worker_thread = MySQLWorkerThread("install", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.progress_signal.connect(self.progress_bar.setValue)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("install", clear_log=True, show_progress=True)
 
     def uninstall_mysql(self):
         """卸载MySQL"""
-        reply = QMessageBox.question(
-            self, "确认卸载", "确定要卸载MySQL吗？\n这将删除所有MySQL数据和配置。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-
-        if reply != QMessageBox.Yes:
-            return
-
-        if self.worker_thread and self.worker_thread.isRunning():
+        if not self._confirm("uninstall", "确认卸载", "确定要卸载MySQL吗？\n这将删除所有MySQL数据和配置。"):
             return
 
-        self.log_text.clear()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-
-        self.worker_thread = MySQLWorkerThread("uninstall", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.progress_signal.connect(self.progress_bar.setValue)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("uninstall", clear_log=True, show_progress=True)
 
     def start_service(self):
         """启动服务"""
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.worker_thread = MySQLWorkerThread("start_service", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("start_service")
 
     def stop_service(self):
         """停止服务"""
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.worker_thread = MySQLWorkerThread("stop_service", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("stop_service")
 
     def restart_service(self):
         """重启服务"""
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.worker_thread = MySQLWorkerThread("restart_service", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("restart_service")
 
     def install_service(self):
         """安装服务"""
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.worker_thread = MySQLWorkerThread("install_service", self.installer)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("install_service")
 
     def set_root_password(self):
         """设置root密码"""
@@ -616,13 +687,44 @@ class MySQLTab(QWidget):
             QMessageBox.warning(self, "警告", "请输入密码")
             return
 
-        if self.worker_thread and self.worker_thread.isRunning():
-            return
-
-        self.worker_thread = MySQLWorkerThread("set_password", self.installer, password=password)
-        self.worker_thread.log_signal.connect(self.add_log)
-        self.worker_thread.finished_signal.connect(self.on_operation_finished)
-        self.worker_thread.start()
+        self._start_op("set_password", password=password)
+
+    def _confirm(self, key: str, title: str, text: str) -> bool:
+        """弹出确认对话框，返回用户是否选择了“是”"""
+        box = self._confirm_boxes.get(key)
+        if box is None:
+            box = QMessageBox(QMessageBox.Question, title, text,
+                              QMessageBox.Yes | QMessageBox.No, self)
+            self._confirm_boxes[key] = box
+        return box.exec() == QMessageBox.Yes
+
+    def _start_op(self, operation: str, clear_log: bool = False,
+                  show_progress: bool = False, **kwargs) -> bool:
+        """创建任务并提交到线程池，已有操作在执行时返回 False"""
+        if self._busy:
+            return False
+
+        if operation not in MySQLJob._OPS:
+            QMessageBox.warning(self, "失败", f"未知操作: {operation}")
+            return False
+
+        if clear_log:
+            self.log_text.clear()
+
+        # 信号总是跨线程发出，显式使用队列连接
+        job = MySQLJob(operation, self.installer, **kwargs)
+        job.signals.log.connect(self.add_log, Qt.QueuedConnection)
+        if show_progress:
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setValue(0)
+            job.signals.progress.connect(self.progress_bar.setValue, Qt.QueuedConnection)
+        job.signals.finished.connect(self.on_operation_finished, Qt.QueuedConnection)
+
+        self._busy = True
+        # 保留引用，直到完成信号送达前信号对象不被回收
+        self._job = job
+        self.pool.start(job)
+        return True
 
     def apply_basic_config(self):
         """应用基本配置"""
@@ -647,12 +749,7 @@ class MySQLTab(QWidget):
 
     def add_performance_config(self):
         """添加性能优化配置"""
-        reply = QMessageBox.question(
-            self, "确认添加", "确定要添加性能优化配置吗？\n这将修改MySQL配置文件。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-
-        if reply != QMessageBox.Yes:
+        if not self._confirm("performance", "确认添加", "确定要添加性能优化配置吗？\n这将修改MySQL配置文件。"):
             return
 
         try:
@@ -667,12 +764,7 @@ class MySQLTab(QWidget):
 
     def add_security_config(self):
         """添加安全配置"""
-        reply = QMessageBox.question(
-            self, "确认添加", "确定要添加安全配置吗？\n这将修改MySQL配置文件。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-
-        if reply != QMessageBox.Yes:
+        if not self._confirm("security", "确认添加", "确定要添加安全配置吗？\n这将修改MySQL配置文件。"):
             return
 
         try:
@@ -718,10 +810,8 @@ class MySQLTab(QWidget):
             config_file = config.get('config_file')
 
             if config_file and os.path.exists(config_file):
-                if sys.platform == "win32":
-                    os.startfile(config_file)
-                else:
-                    subprocess.run(["xdg-open", config_file])
+                # 交给系统默认程序打开，不阻塞界面线程
+                QDesktopServices.openUrl(QUrl.fromLocalFile(config_file))
             else:
                 QMessageBox.warning(self, "警告", "配置文件不存在")
 
@@ -730,16 +820,52 @@ class MySQLTab(QWidget):
 
     def clear_history(self):
         """清除历史记录"""
-        self.history_table.setRowCount(0)
+        self._history_model.clear()
 
     def add_log(self, message: str):
-        """添加日志"""
-        self.log_text.append(message)
-        self.log_text.moveCursor(QTextCursor.End)
+        """添加日志，缓冲后由定时器统一写入"""
+        self._pending_logs.append(message + "\n")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_logs(self):
+        """将缓冲的日志一次性插入到文本末尾"""
+        self._log_flush_timer.stop()
+        if not self._pending_logs:
+            return
+
+        # 只有已经停在底部时才自动滚动，不打断用户向上翻看
+        scroll_bar = self.log_text.verticalScrollBar()
+        stick = scroll_bar.value() >= scroll_bar.maximum() - 4
+
+        self.log_text.setUpdatesEnabled(False)
+        try:
+            # 使用独立光标写入，不移动文本框自身的光标和选区
+            cursor = QTextCursor(self.log_text.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText("".join(self._pending_logs))
+        finally:
+            self.log_text.setUpdatesEnabled(True)
+
+        if stick:
+            scroll_bar.setValue(scroll_bar.maximum())
+        self._pending_logs.clear()
 
     def on_operation_finished(self, success: bool, message: str):
         """操作完成回调"""
+        if self._job is not None:
+            # 断开已完成任务的连接，之后排队到达的信号不再分发，信号对象可以立即释放
+            signals = self._job.signals
+            for signal in (signals.log, signals.progress, signals.finished):
+                try:
+                    signal.disconnect()
+                except (RuntimeError, TypeError):
+                    pass
+        self._busy = False
+        self._job = None
+        self._flush_logs()
         self.progress_bar.setVisible(False)
+        self.status_probe.invalidate()
         self.refresh_status()
 
         if success:
@@ -748,66 +874,82 @@ class MySQLTab(QWidget):
             QMessageBox.warning(self, "失败", message)
 
     def refresh_status(self):
-        """刷新状态"""
+        """刷新状态，探测在后台线程执行"""
+        self.status_probe.request()
+
+    def _apply_status(self, info: dict):
+        """应用探测到的状态，只做界面更新"""
+        if "error" in info:
+            print(f"刷新MySQL状态失败: {info['error']}")
+            return
+        self._last_status = info
+        self._update_status_widgets(info)
+
+        status_text = info["service_status"].get('status', 'unknown')
+        self._update_polling(info["installed"], status_text)
+
+        # 添加历史记录
+        if status_text != 'unknown':
+            self.add_history_record(status_text)
+
+    def _update_status_widgets(self, info: dict):
+        """按状态更新已创建的控件"""
+        is_installed = info["installed"]
+        version = info["version"] if is_installed else None
+        status_text = info["service_status"].get('status', 'unknown')
+
         # 更新安装状态
-        if self.installer.is_mysql_installed():
-            self.install_status_label.setText("已安装")
-            version = self.installer.get_mysql_version()
+        if is_installed:
+            self._set_text(self.install_status_label, "已安装")
             if version:
-                self.version_label.setText(version)
+                self._set_text(self.version_label, version)
             else:
-                self.version_label.setText("已安装")
+                self._set_text(self.version_label, "已安装")
         else:
-            self.install_status_label.setText("未安装")
-            self.version_label.setText("未安装")
+            self._set_text(self.install_status_label, "未安装")
+            self._set_text(self.version_label, "未安装")
 
         # 更新服务状态
-        status = self.installer.get_service_status()
-        status_text = status.get('status', 'unknown')
-        self.service_status_label.setText(status_text)
-        self.monitor_status_label.setText(status_text)
+        if hasattr(self, 'monitor_status_label'):
+            self._set_text(self.monitor_status_label, status_text)
 
         # 更新配置信息
-        config = self.config_manager.get_current_config()
-        config_info = self.config_manager.get_config_summary()
-        self.config_info_text.setPlainText(config_info)
+        # 摘要在后台按配置文件 mtime 缓存，内容未变时不重设文本
+        summary = info["config_summary"]
+        if hasattr(self, 'config_info_text') and self.config_info_text.toPlainText() != summary:
+            self.config_info_text.setPlainText(summary)
 
         # 更新按钮状态
-        is_installed = self.installer.is_mysql_installed()
-        self.install_btn.setEnabled(not is_installed)
-        self.uninstall_btn.setEnabled(is_installed)
-        self.start_service_btn.setEnabled(is_installed and status_text != 'running')
-        self.stop_service_btn.setEnabled(is_installed and status_text == 'running')
-        self.restart_service_btn.setEnabled(is_installed)
-        self.install_service_btn.setEnabled(is_installed)
-        self.set_password_btn.setEnabled(is_installed)
-
-        # 添加历史记录
-        if status_text != 'unknown':
-            self.add_history_record(status_text)
+        self._set_enabled(self.install_btn, not is_installed)
+        self._set_enabled(self.uninstall_btn, is_installed)
+        self._set_enabled(self.install_service_btn, is_installed)
+        if hasattr(self, 'service_status_label'):
+            self._set_text(self.service_status_label, status_text)
+            self._set_enabled(self.start_service_btn, is_installed and status_text != 'running')
+            self._set_enabled(self.stop_service_btn, is_installed and status_text == 'running')
+            self._set_enabled(self.restart_service_btn, is_installed)
+            self._set_enabled(self.set_password_btn, is_installed)
+
+    @staticmethod
+    def _set_text(label: QLabel, text: str):
+        """文本变化时才更新，避免无谓的重绘"""
+        if label.text() != text:
+            label.setText(text)
+
+    @staticmethod
+    def _set_enabled(widget: QWidget, enabled: bool):
+        """状态变化时才更新，避免无谓的重绘"""
+        # 比较控件自身的禁用标记，不受父控件禁用状态影响
+        if widget.testAttribute(Qt.WA_ForceDisabled) == enabled:
+            widget.setEnabled(enabled)
 
     def add_history_record(self, status_text: str):
         """添加历史记录"""
-        import datetime
-
-        row = self.history_table.rowCount()
-        self.history_table.insertRow(row)
-
-        # 时间
-        time_item = QTableWidgetItem(datetime.datetime.now().strftime("%H:%M:%S"))
-        self.history_table.setItem(row, 0, time_item)
-
-        # 状态
-        status_item = QTableWidgetItem(status_text)
-        self.history_table.setItem(row, 1, status_item)
-
-        # 连接数和查询数（这里可以根据实际情况实现）
-        connections_item = QTableWidgetItem("N/A")
-        self.history_table.setItem(row, 2, connections_item)
-
-        queries_item = QTableWidgetItem("N/A")
-        self.history_table.setItem(row, 3, queries_item)
-
-        # 限制历史记录数量
-        if self.history_table.rowCount() > 100:
-            self.history_table.removeRow(0)
\ No newline at end of file
+        # 时间、状态、连接数和查询数（后两项可以根据实际情况实现）
+        # 模型最多保留100条记录
+        self._history_model.append((
+            time.strftime("%H:%M:%S"),
+            status_text,
+            "N/A",
+            "N/A",
+        ))
\ No newline at end of file
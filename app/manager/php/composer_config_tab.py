@@ -8,6 +8,9 @@ Composer 配置页面 GUI
 import sys
 import time
 import threading
+from collections import deque
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, List, Tuple
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
@@ -15,19 +18,25 @@ from PySide6.QtWidgets import (
     QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
     QSplitter, QFrame
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal, QTimer
+from PySide6.QtGui import QTextCursor
 
+from ..common.ui_utils import title_font
 from .composer_config import ComposerConfigurator
 
 
-class ComposerMirrorTestThread(QThread):
-    """Composer镜像源测试线程"""
+class ComposerConfigTestSignals(QObject):
+    """Composer镜像源测试任务信号"""
     progress_signal = Signal(str)  # 测试进度信号
     result_signal = Signal(list)  # 测试结果信号
 
+
+class ComposerConfigTestJob(QRunnable):
+    """Composer镜像源测试任务，在全局线程池中执行"""
+
     def __init__(self, configurator: ComposerConfigurator, timeout: int = 5):
         super().__init__()
+        self.signals = ComposerConfigTestSignals()
         self.configurator = configurator
         self.timeout = timeout
         self.is_running = False
@@ -36,24 +45,35 @@ class ComposerMirrorTestThread(QThread):
         """执行测试"""
         self.is_running = True
         results = []
+        mirrors = self.configurator.MIRRORS
 
-        for key, mirror in self.configurator.MIRRORS.items():
-            if not self.is_running:
-                break
-
-            self.progress_signal.emit(f"正在测试 {mirror['name']}...")
-
-            speed = self.configurator.test_mirror_speed(key, mirror, self.timeout)
+        # 各镜像源的测试都在等待网络，并发执行，总耗时约为单个超时
+        self.signals.progress_signal.emit(f"正在测试 {len(mirrors)} 个镜像源...")
+        executor = ThreadPoolExecutor(max_workers=len(mirrors))
+        try:
+            futures = {
+                executor.submit(self.configurator.test_mirror_speed, key, mirror, self.timeout): (key, mirror)
+                for key, mirror in mirrors.items()
+            }
+            for future in as_completed(futures):
+                if not self.is_running:
+                    break
 
-            if speed is not None:
+                key, mirror = futures[future]
+                speed = future.result()
                 results.append((key, mirror['name'], speed))
-            else:
-                results.append((key, mirror['name'], None))
+                self.signals.progress_signal.emit(f"{mirror['name']} 测试完成")
+        finally:
+            # 停止时取消尚未开始的测试，不等待进行中的请求
+            executor.shutdown(wait=self.is_running, cancel_futures=True)
 
-        # 排序
-        results.sort(key=lambda x: (x[2] is None, x[2] if x[2] is not None else float('inf')))
+        # 排序：可用的按响应时间升序，失败的保持原顺序放在最后
+        ok = [r for r in results if r[2] is not None]
+        bad = [r for r in results if r[2] is None]
+        ok.sort(key=itemgetter(2))
+        results = ok + bad
 
-        self.result_signal.emit(results)
+        self.signals.result_signal.emit(results)
 
     def stop(self):
         """停止测试"""
@@ -66,7 +86,15 @@ class ComposerConfigTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.configurator = ComposerConfigurator()
-        self.test_thread = None
+        self.test_job = None
+
+        # 测试进度消息缓冲，定时只显示最新的一条
+        self._progress_buf = deque(maxlen=1)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._flush_test_status)
+
         self.init_ui()
         self.load_current_config()
 
@@ -96,10 +124,7 @@ class ComposerConfigTab(QWidget):
 
         # 标题
         title = QLabel("Composer 镜像源配置")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(title_font())
         layout.addWidget(title)
 
         # 当前配置信息组
@@ -182,10 +207,7 @@ class ComposerConfigTab(QWidget):
 
         # 标题
         title = QLabel("镜像源速度测试")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(title_font())
         layout.addWidget(title)
 
         # 测试控制组
@@ -392,17 +414,21 @@ class ComposerConfigTab(QWidget):
         self.progress_bar.setRange(0, 0)  # 无限进度条
         self.status_label.setText("正在测试镜像源速度...")
 
-        # 创建并启动测试线程
-        self.test_thread = ComposerMirrorTestThread(self.configurator)
-        self.test_thread.progress_signal.connect(self.update_test_status)
-        self.test_thread.result_signal.connect(self.show_test_results)
-        self.test_thread.start()
+        # 提交测试任务，保留引用直到结果信号送达
+        self.test_job = ComposerConfigTestJob(self.configurator)
+        self.test_job.signals.progress_signal.connect(self.update_test_status)
+        self.test_job.signals.result_signal.connect(self.show_test_results)
+        QThreadPool.globalInstance().start(self.test_job)
 
     def stop_test(self):
         """停止测试"""
-        if self.test_thread and self.test_thread.isRunning():
-            self.test_thread.stop()
-            self.test_thread.wait()
+        if self.test_job:
+            # 任务会在当前镜像测试完成后退出，不再等待也不再显示它的结果
+            self.test_job.stop()
+            self.test_job.signals.progress_signal.disconnect(self.update_test_status)
+            self.test_job.signals.result_signal.disconnect(self.show_test_results)
+            self.test_job = None
+        self._discard_test_status()
 
         self.test_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -410,11 +436,26 @@ class ComposerConfigTab(QWidget):
         self.status_label.setText("测试已停止")
 
     def update_test_status(self, message):
-        """更新测试状态"""
-        self.status_label.setText(message)
+        """更新测试状态，缓冲后由定时器统一刷新"""
+        self._progress_buf.append(message)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_test_status(self):
+        """显示缓冲中最新的测试进度"""
+        if self._progress_buf:
+            self.status_label.setText(self._progress_buf.pop())
+
+    def _discard_test_status(self):
+        """丢弃尚未显示的测试进度"""
+        self._progress_timer.stop()
+        self._progress_buf.clear()
 
     def show_test_results(self, results):
         """显示测试结果"""
+        self.test_job = None
+        self._discard_test_status()
+
         # 创建镜像源到表格行的映射
         mirror_to_row = {}
         for row in range(self.result_table.rowCount()):
@@ -6,6 +6,7 @@ Composer 独立安装脚本
 """
 
 import os
+import re
 import sys
 import json
 import argparse
@@ -15,17 +16,50 @@ import urllib.request
 import urllib.error
 import shutil
 import hashlib
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
+
+
+class InstallCancelled(Exception):
+    """安装被用户取消"""
 
 
 class ComposerInstaller:
     """Composer 安装器"""
 
-    def __init__(self):
-        """初始化安装器"""
+    def __init__(self, find_php: bool = True):
+        """初始化安装器，find_php=False 时推迟到 refresh() 再查找 PHP"""
         self.temp_dir = Path(tempfile.gettempdir())
+        self.php_executable = None
+        # PHP 查找结果按 PATH 和可执行文件的修改时间失效
+        self._php_lookup_key = None
+        # 版本缓存按 PHP 可执行文件的修改时间失效
+        self._php_version_cache = None
+        self._php_version_key = None
+        if find_php:
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """PATH 或 PHP 可执行文件变化时重新查找 PHP 并清除版本缓存，返回是否重新查找"""
+        if self._php_lookup_key is not None and self._php_lookup_state() == self._php_lookup_key:
+            return False
+
         self.php_executable = self._find_php_executable()
+        self._php_version_cache = None
+        self._php_version_key = None
+        self._php_lookup_key = self._php_lookup_state()
+        return True
+
+    def _php_lookup_state(self) -> Tuple[str, Optional[str], Optional[int]]:
+        """PHP 查找结果依赖的状态：PATH、当前 PHP 可执行文件路径及其修改时间"""
+        php_path = shutil.which(self.php_executable or 'php')
+        try:
+            mtime = os.stat(php_path).st_mtime_ns if php_path else None
+        except OSError:
+            mtime = None
+        return os.environ.get('PATH', ''), php_path, mtime
 
     def _find_php_executable(self) -> Optional[str]:
         """查找 PHP 可执行文件路径"""
@@ -76,11 +110,39 @@ class ComposerInstaller:
 
         return None
 
-    def check_php_version(self) -> Optional[str]:
-        """检查 PHP 版本是否符合要求"""
+    def check_php_version(self, refresh: bool = False) -> Optional[str]:
+        """检查 PHP 版本是否符合要求，结果缓存在实例上，refresh=True 时重新检查"""
         if not self.php_executable:
             return None
 
+        php_path = shutil.which(self.php_executable) or self.php_executable
+        try:
+            key = (php_path, os.stat(php_path).st_mtime_ns)
+        except OSError:
+            key = None
+
+        if self._php_version_cache is None or refresh or key is None or key != self._php_version_key:
+            # 优先从文件中读取版本号，避免启动 PHP 进程
+            self._php_version_cache = self._read_php_version(php_path) or self._query_php_version()
+            self._php_version_key = key
+        return self._php_version_cache
+
+    def _read_php_version(self, php_path: str) -> Optional[str]:
+        """不启动进程读取 PHP 版本：仅 Windows 可读取 php.exe 的版本资源"""
+        if sys.platform == 'win32':
+            try:
+                from ..common.file_utils import read_file_version_windows
+            except ImportError:
+                # 作为独立脚本运行时没有上级包，改为运行 php --version
+                return None
+            return read_file_version_windows(php_path)
+
+        # 其他系统 php-dev 的 php_version.h 未必对应实际运行的 php，以 php --version 为准
+        return None
+
+    def _query_php_version(self) -> Optional[str]:
+        """运行 php --version 获取版本号"""
+
         try:
             result = subprocess.run(
                 [self.php_executable, '--version'],
@@ -91,7 +153,6 @@ class ComposerInstaller:
             if result.returncode == 0:
                 version_line = result.stdout.split('\n')[0]
                 # 提取版本号
-                import re
                 match = re.search(r'PHP (\d+\.\d+\.\d+)', version_line)
                 if match:
                     return match.group(1)
@@ -125,18 +186,18 @@ class ComposerInstaller:
         required_extensions = ['openssl', 'phar', 'json', 'mbstring']
         missing_extensions = []
 
-        for ext in required_extensions:
-            try:
-                result = subprocess.run(
-                    [self.php_executable, '-m'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode == 0 and ext not in result.stdout:
-                    missing_extensions.append(ext)
-            except Exception:
-                missing_extensions.append(ext)
+        # 扩展列表只需获取一次
+        try:
+            result = subprocess.run(
+                [self.php_executable, '-m'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                missing_extensions = [ext for ext in required_extensions if ext not in result.stdout]
+        except Exception:
+            missing_extensions = list(required_extensions)
 
         if missing_extensions:
             print(f"警告: 缺少以下 PHP 扩展: {', '.join(missing_extensions)}")
@@ -198,14 +259,62 @@ class ComposerInstaller:
             print(f"✗ 签名验证失败: {e}")
             return False
 
+    def get_install_dir(self, install_dir: str = None, global_install: bool = True) -> Path:
+        """获取 Composer 的安装目录"""
+        if install_dir:
+            return Path(install_dir)
+        if global_install:
+            # Windows 系统全局安装目录
+            if sys.platform == 'win32':
+                return Path(r'C:\Composer')
+            return Path.home() / '.local' / 'bin'
+        return Path.cwd()
+
+    def _run_streaming(self, cmd: List[str], on_output: Optional[Callable[[str], None]] = None,
+                       timeout: int = 60) -> Tuple[int, str]:
+        """运行命令并逐行转发输出（stderr 合并到 stdout）
+
+        Returns:
+            (退出码, 全部输出)
+        """
+        start = time.monotonic()
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        # 超时后结束进程，读取循环随管道关闭而退出
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+
+        lines = []
+        try:
+            for line in proc.stdout:
+                line = line.rstrip()
+                lines.append(line)
+                if on_output and line:
+                    on_output(line)
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+
+        if time.monotonic() - start >= timeout:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return returncode, "\n".join(lines)
+
     def install_composer(self, setup_file: Path, install_dir: str = None,
-                        global_install: bool = True) -> bool:
+                        global_install: bool = True,
+                        on_output: Optional[Callable[[str], None]] = None) -> bool:
         """安装 Composer
 
         Args:
             setup_file: 安装器文件路径
             install_dir: 安装目录
             global_install: 是否全局安装
+            on_output: 接收安装器输出的回调，逐行调用
 
         Returns:
             安装成功返回 True，失败返回 False
@@ -214,17 +323,7 @@ class ComposerInstaller:
             print(f"\n正在安装 Composer...")
 
             # 确定安装目录
-            if install_dir:
-                target_dir = Path(install_dir)
-            elif global_install:
-                # Windows 系统全局安装目录
-                if sys.platform == 'win32':
-                    target_dir = Path(r'C:\Composer')
-                else:
-                    target_dir = Path.home() / '.local' / 'bin'
-            else:
-                target_dir = Path.cwd()
-
+            target_dir = self.get_install_dir(install_dir, global_install)
             target_dir.mkdir(parents=True, exist_ok=True)
             composer_phar = target_dir / 'composer.phar'
             composer_bat = target_dir / 'composer.bat'
@@ -236,14 +335,9 @@ class ComposerInstaller:
                 install_cmd.append('--filename')
                 install_cmd.append('composer')
 
-            result = subprocess.run(
-                install_cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            returncode, output = self._run_streaming(install_cmd, on_output, timeout=60)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 print("✓ Composer 安装成功!")
 
                 # Windows 系统创建 bat 文件
@@ -265,7 +359,7 @@ class ComposerInstaller:
                 if global_install:
                     self._add_to_path(target_dir)
             else:
-                print(f"✗ 安装失败: {result.stderr}")
+                print(f"✗ 安装失败: {output}")
                 return False
 
         except Exception as e:
@@ -363,8 +457,23 @@ class ComposerInstaller:
 
         return False
 
-    def install(self, install_dir: str = None, global_install: bool = True) -> bool:
-        """执行完整安装流程"""
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]):
+        """已请求取消时抛出 InstallCancelled"""
+        if cancel_event is not None and cancel_event.is_set():
+            raise InstallCancelled()
+
+    def install(self, install_dir: str = None, global_install: bool = True,
+                on_output: Optional[Callable[[str], None]] = None,
+                cancel_event: Optional[threading.Event] = None) -> bool:
+        """执行完整安装流程
+
+        Args:
+            install_dir: 安装目录
+            global_install: 是否全局安装
+            on_output: 接收安装器输出的回调，逐行调用
+            cancel_event: 取消事件，在各阶段之间检查，已设置时抛出 InstallCancelled
+        """
         print(f"\n{'='*60}")
         print("  Composer 安装程序")
         print(f"{'='*60}")
@@ -372,18 +481,26 @@ class ComposerInstaller:
         # 检查 PHP 环境
         if not self.check_php_requirements():
             return False
+        self._check_cancelled(cancel_event)
 
         # 下载安装器
         setup_file = self.download_composer()
         if not setup_file:
             return False
 
-        # 验证安装器
-        if not self.verify_installer(setup_file):
-            return False
+        try:
+            self._check_cancelled(cancel_event)
+
+            # 验证安装器
+            if not self.verify_installer(setup_file):
+                return False
+            self._check_cancelled(cancel_event)
+        except InstallCancelled:
+            setup_file.unlink(missing_ok=True)
+            raise
 
         # 安装 Composer
-        if not self.install_composer(setup_file, install_dir, global_install):
+        if not self.install_composer(setup_file, install_dir, global_install, on_output):
             return False
 
         # 清理临时文件
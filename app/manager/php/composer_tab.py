@@ -5,34 +5,86 @@ Composer 综合管理页面
 提供 Composer 的安装和配置功能
 """
 
+import os
 import sys
 import time
+import shutil
 import threading
+from collections import deque
 from typing import Dict, Optional, List, Tuple
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
     QPushButton, QComboBox, QTextEdit, QGroupBox, QMessageBox,
     QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
-    QSplitter, QFrame, QTabWidget, QLineEdit, QFileDialog
+    QSplitter, QFrame, QTabWidget, QLineEdit, QFileDialog, QButtonGroup
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtCore import Qt, QFileSystemWatcher, QObject, QRunnable, QThreadPool, Signal, QTimer
+from PySide6.QtGui import QTextCursor
 
+from ..common.ui_utils import title_font
 from .composer_config import ComposerConfigurator
-from .composer_install import ComposerInstaller
+from .composer_install import ComposerInstaller, InstallCancelled
 
 
-class ComposerInstallThread(QThread):
-    """Composer安装线程"""
+class ComposerInstallSignals(QObject):
+    """Composer安装任务信号"""
     progress_signal = Signal(str)  # 安装进度信号
     result_signal = Signal(bool)  # 安装结果信号
 
-    def __init__(self, install_dir: str = None, local_install: bool = False):
+
+class ComposerStatusSignals(QObject):
+    """Composer环境状态检查信号"""
+    result_signal = Signal(dict)  # 检查结果信号
+
+
+class ComposerStatusJob(QRunnable):
+    """Composer环境状态检查任务，查找 PHP 和检查 Composer 都会启动子进程，放到线程池中执行"""
+
+    def __init__(self, installer: ComposerInstaller, configurator: ComposerConfigurator):
+        super().__init__()
+        self.signals = ComposerStatusSignals()
+        self.installer = installer
+        self.configurator = configurator
+
+    def run(self):
+        """执行检查"""
+        installer = self.installer
+        # 仅在 PATH 或 PHP 可执行文件变化时重新查找
+        installer.refresh()
+        if installer.php_executable:
+            php_status = "PHP 状态: 已安装"
+            version = installer.check_php_version()
+            php_version = f"PHP 版本: {version}" if version else "PHP 版本: 获取失败"
+        else:
+            php_status = "PHP 状态: 未找到"
+            php_version = "PHP 版本: -"
+
+        if self.configurator.check_composer_installed():
+            composer_status = "Composer 状态: 已安装"
+            install_text = "重新安装"
+        else:
+            composer_status = "Composer 状态: 未安装"
+            install_text = "开始安装"
+
+        self.signals.result_signal.emit({
+            'php_status': php_status,
+            'php_version': php_version,
+            'composer_status': composer_status,
+            'install_text': install_text,
+        })
+
+
+class ComposerInstallJob(QRunnable):
+    """Composer安装任务，在全局线程池中执行"""
+
+    def __init__(self, installer: ComposerInstaller, install_dir: str = None, local_install: bool = False):
         super().__init__()
+        self.signals = ComposerInstallSignals()
         self.install_dir = install_dir
         self.local_install = local_install
-        self.installer = ComposerInstaller()
+        self.installer = installer
         self.is_running = False
+        self._cancel = threading.Event()
 
     def run(self):
         """执行安装"""
@@ -40,62 +92,34 @@ class ComposerInstallThread(QThread):
         try:
             # 检查PHP环境
             if not self.installer.check_php_requirements():
-                self.result_signal.emit(False)
+                self.signals.result_signal.emit(False)
                 return
 
             # 安装Composer
             success = self.installer.install(
                 install_dir=self.install_dir,
-                global_install=not self.local_install
+                global_install=not self.local_install,
+                on_output=self.signals.progress_signal.emit,
+                cancel_event=self._cancel
             )
-            self.result_signal.emit(success)
+            self.signals.result_signal.emit(success)
 
+        except InstallCancelled:
+            self.signals.progress_signal.emit("安装已取消")
+            self.signals.result_signal.emit(False)
         except Exception as e:
-            self.progress_signal.emit(f"安装失败: {str(e)}")
-            self.result_signal.emit(False)
-
-    def stop(self):
-        """停止安装"""
-        self.is_running = False
-
-
-class ComposerConfigTestThread(QThread):
-    """Composer配置测试线程"""
-    progress_signal = Signal(str)  # 测试进度信号
-    result_signal = Signal(list)  # 测试结果信号
-
-    def __init__(self, configurator: ComposerConfigurator, timeout: int = 5):
-        super().__init__()
-        self.configurator = configurator
-        self.timeout = timeout
-        self.is_running = False
-
-    def run(self):
-        """执行测试"""
-        self.is_running = True
-        results = []
+            self.signals.progress_signal.emit(f"安装失败: {str(e)}")
+            self.signals.result_signal.emit(False)
 
-        for key, mirror in self.configurator.MIRRORS.items():
-            if not self.is_running:
-                break
-
-            self.progress_signal.emit(f"正在测试 {mirror['name']}...")
-
-            speed = self.configurator.test_mirror_speed(key, mirror, self.timeout)
-
-            if speed is not None:
-                results.append((key, mirror['name'], speed))
-            else:
-                results.append((key, mirror['name'], None))
-
-        # 排序
-        results.sort(key=lambda x: (x[2] is None, x[2] if x[2] is not None else float('inf')))
-
-        self.result_signal.emit(results)
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel.is_set()
 
     def stop(self):
-        """停止测试"""
+        """停止安装，在安装的下一个阶段之间生效"""
         self.is_running = False
+        self._cancel.set()
 
 
 class ComposerTab(QWidget):
@@ -104,11 +128,54 @@ class ComposerTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.configurator = ComposerConfigurator()
-        self.install_thread = None
-        self.test_thread = None
+        # PHP 查找会启动子进程，由状态检查任务在线程池中完成
+        self.installer = ComposerInstaller(find_php=False)
+        self.install_job = None
+        self.status_job = None
+        self._install_target = None
+
+        # 安装日志只保留最近500行，定时批量刷新到界面
+        self._log_buf = deque(maxlen=500)
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        # 日志时间戳按秒缓存
+        self._ts_second = None
+        self._ts_cache = ""
+
+        # 状态刷新节流：500ms 内最多执行一次，期间的请求合并到窗口结束时执行
+        self._status_pending = False
+        self._status_throttle = QTimer(self)
+        self._status_throttle.setSingleShot(True)
+        self._status_throttle.setInterval(500)
+        self._status_throttle.timeout.connect(self._on_status_throttle_timeout)
+
         self.init_ui()
         self.load_status()
 
+        # 监视 Composer 安装目录和 PHP 所在目录，发生变化时才重新检查状态
+        self._fsw = QFileSystemWatcher(self)
+        self._fsw.directoryChanged.connect(self.load_status)
+        self._fsw.fileChanged.connect(self.load_status)
+        self._watch_paths(self._status_watch_paths())
+
+    def _status_watch_paths(self) -> List[str]:
+        """需要监视的目录：默认全局安装目录和 PHP 可执行文件所在目录"""
+        paths = [str(self.installer.get_install_dir(global_install=True))]
+        if self.installer.php_executable:
+            php_path = shutil.which(self.installer.php_executable)
+            if php_path:
+                paths.append(os.path.dirname(php_path))
+        return paths
+
+    def _watch_paths(self, paths: List[str]):
+        """添加监视路径，忽略不存在或已监视的路径"""
+        watched = set(self._fsw.directories())
+        new_paths = [p for p in paths if os.path.isdir(p) and p not in watched]
+        if new_paths:
+            self._fsw.addPaths(new_paths)
+
     def init_ui(self):
         """初始化界面"""
         layout = QVBoxLayout(self)
@@ -121,9 +188,24 @@ class ComposerTab(QWidget):
         self.install_tab = self.create_install_tab()
         self.tab_widget.addTab(self.install_tab, "安装 Composer")
 
-        # 配置标签页
+        # 配置标签页先放占位控件，首次切换到时再创建
+        self.config_tab = None
+        self.tab_widget.addTab(QWidget(), "配置镜像源")
+        self.tab_widget.currentChanged.connect(self._maybe_build_config_tab)
+
+    def _maybe_build_config_tab(self, index: int):
+        """首次切换到配置标签页时创建其内容"""
+        if index != 1 or self.config_tab is not None:
+            return
+
         self.config_tab = self.create_config_tab()
-        self.tab_widget.addTab(self.config_tab, "配置镜像源")
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, self.config_tab, "配置镜像源")
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
 
     def create_install_tab(self) -> QWidget:
         """创建安装标签页"""
@@ -132,10 +214,7 @@ class ComposerTab(QWidget):
 
         # 标题
         title = QLabel("Composer 安装")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(title_font())
         layout.addWidget(title)
 
         # 环境检查组
@@ -165,7 +244,6 @@ class ComposerTab(QWidget):
         self.global_radio = QPushButton("全局安装")
         self.global_radio.setCheckable(True)
         self.global_radio.setChecked(True)
-        self.global_radio.clicked.connect(self.on_install_mode_changed)
         install_layout.addWidget(self.global_radio, 0, 0)
 
         self.global_info = QLabel("安装到系统目录，所有项目可用")
@@ -174,9 +252,14 @@ class ComposerTab(QWidget):
         # 本地安装单选
         self.local_radio = QPushButton("本地安装")
         self.local_radio.setCheckable(True)
-        self.local_radio.clicked.connect(self.on_install_mode_changed)
         install_layout.addWidget(self.local_radio, 1, 0)
 
+        # 两个按钮互斥，由按钮组保证只有一个处于选中状态
+        self._mode_group = QButtonGroup(self)
+        self._mode_group.setExclusive(True)
+        self._mode_group.addButton(self.global_radio)
+        self._mode_group.addButton(self.local_radio)
+
         self.local_info = QLabel("安装到当前目录，仅当前项目可用")
         install_layout.addWidget(self.local_info, 1, 1, 1, 2)
 
@@ -203,6 +286,12 @@ class ComposerTab(QWidget):
         self.install_btn.clicked.connect(self.start_install)
         control_layout.addWidget(self.install_btn)
 
+        # 取消按钮
+        self.cancel_install_btn = QPushButton("取消安装")
+        self.cancel_install_btn.setEnabled(False)
+        self.cancel_install_btn.clicked.connect(self.cancel_install)
+        control_layout.addWidget(self.cancel_install_btn)
+
         # 进度条
         self.install_progress = QProgressBar()
         self.install_progress.setVisible(False)
@@ -245,39 +334,53 @@ class ComposerTab(QWidget):
         return ComposerConfigTab(self)
 
     def load_status(self):
-        """加载环境状态"""
-        # 检查PHP
-        installer = ComposerInstaller()
-        if installer.php_executable:
-            self.php_status_label.setText("PHP 状态: 已安装")
+        """加载环境状态（节流）"""
+        if self._status_throttle.isActive():
+            self._status_pending = True
+            return
 
-            version = installer.check_php_version()
-            if version:
-                self.php_version_label.setText(f"PHP 版本: {version}")
-            else:
-                self.php_version_label.setText("PHP 版本: 获取失败")
-        else:
-            self.php_status_label.setText("PHP 状态: 未找到")
-            self.php_version_label.setText("PHP 版本: -")
+        self._load_status_impl()
+        self._status_throttle.start()
 
-        # 检查Composer
-        if self.configurator.check_composer_installed():
-            self.composer_status_label.setText("Composer 状态: 已安装")
-            self.install_btn.setText("重新安装")
-        else:
-            self.composer_status_label.setText("Composer 状态: 未安装")
-            self.install_btn.setText("开始安装")
+    def _on_status_throttle_timeout(self):
+        """节流窗口结束，执行期间合并的刷新请求"""
+        if self._status_pending:
+            self._status_pending = False
+            self.load_status()
 
-    def on_install_mode_changed(self):
-        """安装模式改变"""
-        if self.global_radio.isChecked():
-            self.local_radio.setChecked(False)
-        else:
-            self.global_radio.setChecked(False)
+    def _load_status_impl(self):
+        """在线程池中加载环境状态，检查进行中时合并到本次检查结束后执行"""
+        if self.status_job is not None:
+            self._status_pending = True
+            return
+
+        self.status_job = ComposerStatusJob(self.installer, self.configurator)
+        self.status_job.signals.result_signal.connect(self._on_status_loaded)
+        QThreadPool.globalInstance().start(self.status_job)
+
+    def _on_status_loaded(self, status: dict):
+        """状态检查完成，统一更新界面"""
+        self.status_job = None
+
+        # 标签和按钮都在安装页上，暂停其重绘，更新完成后只绘制一次
+        self.install_tab.setUpdatesEnabled(False)
+        try:
+            self.php_status_label.setText(status['php_status'])
+            self.php_version_label.setText(status['php_version'])
+            self.composer_status_label.setText(status['composer_status'])
+            self.install_btn.setText(status['install_text'])
+        finally:
+            self.install_tab.setUpdatesEnabled(True)
+
+        # PHP 可能是刚找到的，补充监视其所在目录
+        self._watch_paths(self._status_watch_paths())
+
+        if self._status_pending and not self._status_throttle.isActive():
+            self._status_pending = False
+            self.load_status()
 
     def browse_directory(self):
         """浏览目录"""
-        from PySide6.QtWidgets import QFileDialog
         directory = QFileDialog.getExistingDirectory(
             self, "选择安装目录"
         )
@@ -298,8 +401,7 @@ class ComposerTab(QWidget):
                 return
 
         # 检查PHP环境
-        installer = ComposerInstaller()
-        if not installer.check_php_requirements():
+        if not self.installer.check_php_requirements():
             self.add_install_log("PHP 环境检查失败，无法安装")
             return
 
@@ -309,28 +411,52 @@ class ComposerTab(QWidget):
 
         # 开始安装
         self.install_btn.setEnabled(False)
+        self.cancel_install_btn.setEnabled(True)
         self.install_progress.setVisible(True)
         self.install_progress.setRange(0, 0)  # 无限进度条
         self.add_install_log("开始安装 Composer...")
 
-        # 创建安装线程
-        self.install_thread = ComposerInstallThread(install_dir, local_install)
-        self.install_thread.progress_signal.connect(self.add_install_log)
-        self.install_thread.result_signal.connect(self.on_install_finished)
-        self.install_thread.start()
+        self._install_target = str(self.installer.get_install_dir(install_dir, not local_install))
+
+        # 提交安装任务，保留引用直到结果信号送达
+        self.install_job = ComposerInstallJob(self.installer, install_dir, local_install)
+        self.install_job.signals.progress_signal.connect(self.add_install_log)
+        self.install_job.signals.result_signal.connect(self.on_install_finished)
+        QThreadPool.globalInstance().start(self.install_job)
+
+    def cancel_install(self):
+        """取消安装"""
+        if self.install_job:
+            self.install_job.stop()
+            self.cancel_install_btn.setEnabled(False)
+            self.add_install_log("正在取消安装...")
 
     def add_install_log(self, message):
         """添加安装日志"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.install_log.append(log_entry)
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts_cache = time.strftime("%H:%M:%S", time.localtime(now))
+        self._log_buf.append(f"[{self._ts_cache}] {message}")
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """将缓冲的日志写入日志框"""
+        self.install_log.setPlainText("\n".join(self._log_buf))
+        self.install_log.moveCursor(QTextCursor.End)
 
     def on_install_finished(self, success):
         """安装完成"""
+        cancelled = self.install_job is not None and self.install_job.cancelled
+        self.install_job = None
         self.install_btn.setEnabled(True)
+        self.cancel_install_btn.setEnabled(False)
         self.install_progress.setVisible(False)
 
-        if success:
+        if cancelled and not success:
+            self.add_install_log("安装已取消")
+        elif success:
             self.add_install_log("安装完成！")
             QMessageBox.information(
                 self,
@@ -345,5 +471,7 @@ class ComposerTab(QWidget):
                 "Composer 安装失败，请检查安装日志了解详情。"
             )
 
-        # 刷新状态
-        self.load_status()
\ No newline at end of file
+        # 安装目录已在监视中时由文件系统事件触发刷新，否则手动刷新并开始监视
+        if self._install_target not in self._fsw.directories():
+            self.load_status()
+            self._watch_paths([self._install_target])
\ No newline at end of file
@@ -7,143 +7,304 @@ PostgreSQL 配置管理模块
 
 import os
 import sys
+import logging
 import json
 import shutil
 import configparser
-import subprocess
 import re
+import glob
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple, Iterable, Iterator, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL 配置文件名
+_CONFIG_NAMES = ('postgresql.conf', 'pg_hba.conf')
+
+# postgresql.conf 配置行: key = value
+_CONF_LINE_RE = re.compile(r'^\s*(\w+)\s*=\s*(.+)$')
+# 仅匹配配置行的键名，用于以二进制方式改写配置
+_KEY_RE_B = re.compile(rb'^\s*(\w+)\s*=')
+# 内存大小配置: 数字 + 单位
+_MEM_RE = re.compile(r'^\d+(?:\.\d+)?\s*(?:B|kB|MB|GB|TB)$')
+
+
+class _TypedConfig(NamedTuple):
+    """validate_config 所需的配置项，数值项已预先转换"""
+    empty: bool
+    port: str
+    port_int: Optional[int]
+    max_connections: str
+    max_connections_int: Optional[int]
+    data_directory: str
+    shared_buffers: str
+
+
+def _parse_config_file(config_file: str) -> Dict[str, str]:
+    """解析 postgresql.conf，返回 {配置项: 值}"""
+    config = {}
+    match_line = _CONF_LINE_RE.match
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # 跳过注释和空行
+            if not line or line.startswith('#'):
+                continue
+
+            # 解析配置项
+            match = match_line(line)
+            if match:
+                key = match.group(1)
+                value = match.group(2).strip("'\"")
+                config[key] = value
+    return config
+
+
+def _to_int(value: str) -> Optional[int]:
+    """转换为整数，格式错误时返回 None"""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _typed_config(config_file: str, mtime_ns: int) -> _TypedConfig:
+    """按 (路径, 修改时间) 缓存 validate_config 用到的配置项"""
+    config = _parse_config_file(config_file)
+    port = config.get('port', '5432')
+    max_connections = config.get('max_connections', '100')
+    return _TypedConfig(
+        empty=not config,
+        port=port,
+        port_int=_to_int(port),
+        max_connections=max_connections,
+        max_connections_int=_to_int(max_connections),
+        data_directory=config.get('data_directory', ''),
+        shared_buffers=config.get('shared_buffers', '128MB'),
+    )
+
+
+def _windows_search_bases() -> Tuple[str, ...]:
+    """Windows 下可能包含 PostgreSQL 目录的根路径"""
+    bases = [
+        os.environ.get('ProgramFiles', r'C:\Program Files'),
+        os.environ.get('ProgramFiles(x86)', r'C:\Program Files (x86)'),
+        'D:\\',
+        'E:\\',
+    ]
+    # 去重并保持顺序
+    return tuple(dict.fromkeys(bases))
+
+
+def _scan_base(pg_root: str) -> List[str]:
+    """在单个 PostgreSQL 根目录下查找各版本的配置文件"""
+    join = os.path.join
+    isfile = os.path.isfile
+    found = []
+    # 版本目录只列举一次，两个配置文件名复用同一结果
+    data_dirs = sorted(glob.glob(join(glob.escape(pg_root), '*', 'data')))
+    for name in _CONFIG_NAMES:
+        for data_dir in data_dirs:
+            path = join(data_dir, name)
+            if isfile(path):
+                found.append(path)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def _scan_config_files(platform: str, bases: Tuple[str, ...]) -> Tuple[str, ...]:
+    """按 PostgreSQL 标准目录结构查找配置文件
+
+    只匹配 <base>/PostgreSQL/<版本>/data/<配置文件>，不再遍历整个 Program Files。
+    多个根目录（通常位于不同磁盘）并行扫描，结果按 bases 顺序合并。
+    """
+    # 不存在 PostgreSQL 目录的根路径直接跳过，不做任何匹配
+    pg_roots = [os.path.join(base, 'PostgreSQL') for base in bases]
+    pg_roots = [root for root in pg_roots if os.path.isdir(root)]
+
+    if len(pg_roots) <= 1:
+        # 只有一个根目录时不值得启动线程池
+        results = map(_scan_base, pg_roots)
+    else:
+        with ThreadPoolExecutor(max_workers=len(pg_roots)) as executor:
+            results = list(executor.map(_scan_base, pg_roots))
+
+    return tuple(path for found in results for path in found)
+
+
+@functools.lru_cache(maxsize=None)
+def _discover_default_paths() -> Tuple[Tuple[str, str], ...]:
+    """获取默认的PostgreSQL安装路径（进程内缓存，返回不可变的键值对元组）"""
+    paths = {}
+
+    if sys.platform == "win32":
+        # Windows 常见安装路径
+        possible_paths = [
+            r"C:\Program Files\PostgreSQL",
+            r"C:\Program Files (x86)\PostgreSQL",
+            r"D:\PostgreSQL",
+            r"E:\PostgreSQL"
+        ]
+
+        for base_path in possible_paths:
+            if os.path.exists(base_path):
+                # 查找PostgreSQL版本目录，DirEntry 自带目录类型，无需再逐个 stat
+                with os.scandir(base_path) as it:
+                    for entry in it:
+                        if entry.name.startswith("PostgreSQL") and entry.is_dir():
+                            version_path = entry.path
+                            paths['installation'] = version_path
+                            paths['bin'] = os.path.join(version_path, 'bin')
+                            paths['data'] = os.path.join(version_path, 'data')
+                            paths['config'] = os.path.join(version_path, 'data', 'postgresql.conf')
+                            paths['hba_config'] = os.path.join(version_path, 'data', 'pg_hba.conf')
+                            break
+                if 'installation' in paths:
+                    break
+
+        # 默认配置文件位置
+        if 'config' not in paths:
+            paths['config'] = r"C:\Program Files\PostgreSQL\16\data\postgresql.conf"
+            paths['hba_config'] = r"C:\Program Files\PostgreSQL\16\data\pg_hba.conf"
+            paths['data'] = r"C:\Program Files\PostgreSQL\16\data"
+
+    else:
+        # Linux/macOS 路径
+        paths.update({
+            'config': '/etc/postgresql/16/main/postgresql.conf',
+            'hba_config': '/etc/postgresql/16/main/pg_hba.conf',
+            'data': '/var/lib/postgresql/16/main',
+            'log': '/var/log/postgresql',
+            'bin': '/usr/lib/postgresql/16/bin'
+        })
+
+    return tuple(paths.items())
+
+
+@functools.lru_cache(maxsize=None)
+def _discover_config_files() -> Tuple[str, ...]:
+    """获取PostgreSQL配置文件列表（进程内缓存）"""
+    config_files = []
+
+    if sys.platform == "win32":
+        default_paths = dict(_discover_default_paths())
+        config_files.extend([
+            default_paths.get('config', ''),
+            default_paths.get('hba_config', '')
+        ])
+        # 检查其他可能的位置
+        config_files.extend(_scan_config_files(sys.platform, _windows_search_bases()))
+    else:
+        config_files.extend([
+            '/etc/postgresql/16/main/postgresql.conf',
+            '/etc/postgresql/16/main/pg_hba.conf',
+            '/var/lib/postgresql/16/main/postgresql.conf',
+            '/var/lib/postgresql/16/main/pg_hba.conf'
+        ])
+
+    # 去重并保持顺序
+    return tuple(f for f in dict.fromkeys(config_files) if f and os.path.exists(f))
+
+
+def _registry_installation() -> Optional[str]:
+    """从注册表 HKLM\\SOFTWARE\\PostgreSQL\\Installations 中读取安装路径"""
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                            r"SOFTWARE\PostgreSQL\Installations") as key:
+            # 一次取得子键数量，避免逐个 EnumKey 直到抛出异常
+            subkey_count = winreg.QueryInfoKey(key)[0]
+            for i in range(subkey_count):
+                try:
+                    subkey_name = winreg.EnumKey(key, i)
+                    with winreg.OpenKey(key, subkey_name) as subkey:
+                        installation_path, _ = winreg.QueryValueEx(subkey, "Base Directory")
+                except OSError:
+                    # 该子键没有 Base Directory，继续检查下一个
+                    continue
+                if installation_path:
+                    return installation_path
+    except OSError:
+        pass
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _find_installation() -> Optional[str]:
+    """查找PostgreSQL安装路径（安装位置在运行期间不会变化，结果进程内缓存）"""
+    if sys.platform == "win32":
+        # 通过注册表查找
+        installation_path = _registry_installation()
+        if installation_path:
+            return installation_path
+
+    # 通过PATH环境变量查找，psql 通常在安装目录的 bin 目录下
+    psql_path = shutil.which('psql')
+    if psql_path:
+        # 返回 bin 的上级目录作为安装路径
+        return os.path.dirname(os.path.dirname(psql_path))
+
+    return None
 
 
 class PostgreSQLConfigManager:
     """PostgreSQL 配置管理器"""
 
-    def __init__(self):
-        """初始化配置管理器"""
+    def __init__(self, refresh: bool = False):
+        """初始化配置管理器
+
+        Args:
+            refresh: 为 True 时丢弃已缓存的路径查找结果并重新查找
+        """
+        if refresh:
+            self.clear_cache()
         self.default_paths = self._get_default_postgresql_paths()
         self.config_files = self._get_config_files()
+        self._conf_path, self._hba_path = self._classify_config_files(self.config_files)
+        # 解析结果缓存: {路径: (st_mtime_ns, 解析结果)}
+        self._config_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._hba_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    @classmethod
+    def clear_cache(cls):
+        """清除进程内缓存的安装路径和配置文件查找结果"""
+        _discover_default_paths.cache_clear()
+        _discover_config_files.cache_clear()
+        _scan_config_files.cache_clear()
+        _find_installation.cache_clear()
 
     def _get_default_postgresql_paths(self) -> Dict[str, str]:
         """获取默认的PostgreSQL安装路径"""
-        paths = {}
-
-        if sys.platform == "win32":
-            # Windows 常见安装路径
-            possible_paths = [
-                r"C:\Program Files\PostgreSQL",
-                r"C:\Program Files (x86)\PostgreSQL",
-                r"D:\PostgreSQL",
-                r"E:\PostgreSQL"
-            ]
-
-            for base_path in possible_paths:
-                if os.path.exists(base_path):
-                    # 查找PostgreSQL版本目录
-                    for item in os.listdir(base_path):
-                        if item.startswith("PostgreSQL"):
-                            version_path = os.path.join(base_path, item)
-                            if os.path.isdir(version_path):
-                                paths['installation'] = version_path
-                                paths['bin'] = os.path.join(version_path, 'bin')
-                                paths['data'] = os.path.join(version_path, 'data')
-                                paths['config'] = os.path.join(version_path, 'data', 'postgresql.conf')
-                                paths['hba_config'] = os.path.join(version_path, 'data', 'pg_hba.conf')
-                                break
-                    if 'installation' in paths:
-                        break
-
-            # 默认配置文件位置
-            if 'config' not in paths:
-                paths['config'] = r"C:\Program Files\PostgreSQL\16\data\postgresql.conf"
-                paths['hba_config'] = r"C:\Program Files\PostgreSQL\16\data\pg_hba.conf"
-                paths['data'] = r"C:\Program Files\PostgreSQL\16\data"
-
-        else:
-            # Linux/macOS 路径
-            paths.update({
-                'config': '/etc/postgresql/16/main/postgresql.conf',
-                'hba_config': '/etc/postgresql/16/main/pg_hba.conf',
-                'data': '/var/lib/postgresql/16/main',
-                'log': '/var/log/postgresql',
-                'bin': '/usr/lib/postgresql/16/bin'
-            })
-
-        return paths
+        return dict(_discover_default_paths())
 
     def _get_config_files(self) -> List[str]:
         """获取PostgreSQL配置文件列表"""
-        config_files = []
-
-        if sys.platform == "win32":
-            config_files.extend([
-                self.default_paths.get('config', ''),
-                self.default_paths.get('hba_config', '')
-            ])
-            # 检查其他可能的位置
-            program_files = os.environ.get('ProgramFiles', 'C:\\Program Files')
-            for root, dirs, files in os.walk(program_files):
-                if 'PostgreSQL' in root:
-                    if 'postgresql.conf' in files:
-                        config_files.append(os.path.join(root, 'postgresql.conf'))
-                    if 'pg_hba.conf' in files:
-                        config_files.append(os.path.join(root, 'pg_hba.conf'))
-        else:
-            config_files.extend([
-                '/etc/postgresql/16/main/postgresql.conf',
-                '/etc/postgresql/16/main/pg_hba.conf',
-                '/var/lib/postgresql/16/main/postgresql.conf',
-                '/var/lib/postgresql/16/main/pg_hba.conf'
-            ])
-
-        return [f for f in config_files if f and os.path.exists(f)]
+        return list(_discover_config_files())
+
+    @staticmethod
+    def _classify_config_files(config_files: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """按文件名区分 postgresql.conf 与 pg_hba.conf，各取第一个"""
+        conf_path = hba_path = None
+        for config_file in config_files:
+            name = os.path.basename(config_file)
+            if name == 'postgresql.conf' and conf_path is None:
+                conf_path = config_file
+            elif name == 'pg_hba.conf' and hba_path is None:
+                hba_path = config_file
+        return conf_path, hba_path
 
     def find_postgresql_installation(self) -> Optional[str]:
         """查找PostgreSQL安装路径"""
-        if sys.platform == "win32":
-            # 通过注册表查找
-            try:
-                import winreg
-                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                   r"SOFTWARE\PostgreSQL\Installations") as key:
-                    i = 0
-                    while True:
-                        try:
-                            subkey_name = winreg.EnumKey(key, i)
-                            with winreg.OpenKey(key, subkey_name) as subkey:
-                                installation_path, _ = winreg.QueryValueEx(subkey, "Base Directory")
-                                return installation_path
-                            i += 1
-                        except WindowsError:
-                            break
-            except:
-                pass
-
-            # 通过PATH环境变量查找
-            try:
-                result = subprocess.run(['psql', '--version'],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    # 从版本信息中可能无法直接获取路径，但可以确认psql已安装
-                    pass
-            except:
-                pass
-
-        else:
-            # Linux/macOS 使用 which 命令
-            try:
-                result = subprocess.run(['which', 'psql'],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    psql_path = result.stdout.strip()
-                    # psql 通常在 bin 目录下
-                    bin_path = os.path.dirname(psql_path)
-                    # 返回上级目录作为安装路径
-                    return os.path.dirname(bin_path)
-            except:
-                pass
-
-        return None
+        return _find_installation()
 
     def read_config(self, config_file: str = None) -> Optional[Dict[str, Any]]:
         """读取PostgreSQL配置文件"""
@@ -154,24 +315,16 @@ class PostgreSQLConfigManager:
             return None
 
         try:
-            config = {}
-            with open(config_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    # 跳过注释和空行
-                    if not line or line.startswith('#'):
-                        continue
-
-                    # 解析配置项
-                    match = re.match(r'^\s*(\w+)\s*=\s*(.+)$', line)
-                    if match:
-                        key = match.group(1)
-                        value = match.group(2).strip("'\"")
-                        config[key] = value
-
-            return config
+            mtime = os.stat(config_file).st_mtime_ns
+            cached = self._config_cache.get(config_file)
+            if cached and cached[0] == mtime:
+                return dict(cached[1])
+
+            config = _parse_config_file(config_file)
+            self._config_cache[config_file] = (mtime, config)
+            return dict(config)
         except Exception as e:
-            print(f"读取配置文件失败: {e}")
+            logger.warning("读取配置文件失败: %s", e)
             return None
 
     def read_hba_config(self, hba_file: str = None) -> Optional[List[Dict[str, Any]]]:
@@ -179,15 +332,17 @@ class PostgreSQLConfigManager:
         if not hba_file:
             hba_file = self.default_paths.get('hba_config', '')
             if not hba_file or not os.path.exists(hba_file):
-                for config_file in self.config_files:
-                    if 'pg_hba.conf' in config_file:
-                        hba_file = config_file
-                        break
+                hba_file = self._hba_path or hba_file
 
         if not hba_file or not os.path.exists(hba_file):
             return None
 
         try:
+            mtime = os.stat(hba_file).st_mtime_ns
+            cached = self._hba_cache.get(hba_file)
+            if cached and cached[0] == mtime:
+                return [dict(rule) for rule in cached[1]]
+
             hba_rules = []
             with open(hba_file, 'r', encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
@@ -196,32 +351,107 @@ class PostgreSQLConfigManager:
                     if not line or line.startswith('#'):
                         continue
 
-                    # 解析HBA规则
+                    # 解析HBA规则: TYPE DATABASE USER ADDRESS [METHOD [OPTIONS...]]
                     parts = line.split()
                     if len(parts) >= 4:
+                        if len(parts) == 4:
+                            # 缺少 METHOD 列时补空，便于直接解包
+                            parts.append('')
+                        rule_type, database, user, address, method, *options = parts
                         rule = {
                             'line_num': line_num,
-                            'type': parts[0],
-                            'database': parts[1],
-                            'user': parts[2],
-                            'address': parts[3] if len(parts) > 3 else '',
-                            'method': parts[4] if len(parts) > 4 else '',
-                            'options': parts[5:] if len(parts) > 5 else []
+                            'type': rule_type,
+                            'database': database,
+                            'user': user,
+                            'address': address,
+                            'method': method,
+                            'options': options
                         }
                         hba_rules.append(rule)
 
-            return hba_rules
+            self._hba_cache[hba_file] = (mtime, hba_rules)
+            return [dict(rule) for rule in hba_rules]
         except Exception as e:
-            print(f"读取HBA配置文件失败: {e}")
+            logger.warning("读取HBA配置文件失败: %s", e)
             return None
 
+    @staticmethod
+    def _load_lines(path: str) -> Iterator[bytes]:
+        """以二进制方式逐行读取配置文件，文件不存在时不产生任何行"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            yield from f
+
+    @staticmethod
+    def _apply_updates(lines: Iterable[bytes], config_data: Dict[str, Any]) -> Iterator[bytes]:
+        """将配置项更新应用到配置文件行上，保留注释和未改动的行
+
+        已存在的配置项原地替换，其余配置项追加到末尾。未改动的行原样输出，
+        新写入的行沿用文件原有的换行符。
+        """
+        pending = {key.encode('utf-8'): key for key in config_data}
+        match_key = _KEY_RE_B.match
+        last_line = b'\n'
+        eol = b'\n'
+
+        for line in lines:
+            last_line = line
+            if line.endswith(b'\r\n'):
+                eol = b'\r\n'
+            stripped = line.strip()
+            if stripped and not stripped.startswith(b'#'):
+                # 检查是否是需要更新的配置项
+                match = match_key(line)
+                if match and match.group(1) in pending:
+                    key = pending.pop(match.group(1))
+                    line = f"{key} = '{config_data[key]}'".encode('utf-8') + eol
+            yield line
+
+        # 添加新的配置项
+        if pending and not last_line.endswith(b'\n'):
+            yield eol
+        for key in pending.values():
+            yield f"{key} = '{config_data[key]}'".encode('utf-8') + eol
+
+    @staticmethod
+    def _replace_file(path: str, lines: Iterable[bytes]):
+        """将内容写入同目录临时文件后原子替换目标文件"""
+        # 目标为符号链接时替换其指向的真实文件，避免把链接本身替换成普通文件
+        path = os.path.realpath(path)
+        tmp = tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(path),
+                                          suffix='.tmp', delete=False)
+        try:
+            with tmp:
+                tmp.writelines(lines)
+
+            if os.path.exists(path):
+                # 临时文件默认权限为 0600，沿用原文件权限
+                shutil.copymode(path, tmp.name)
+                st = os.stat(path)
+                if hasattr(os, 'chown') and (st.st_uid, st.st_gid) != (os.getuid(), os.getgid()):
+                    try:
+                        # 以 root 运行时临时文件属主为 root，需还原为 postgres 等原属主，
+                        # 否则服务进程无法读取 pg_hba.conf
+                        os.chown(tmp.name, st.st_uid, st.st_gid)
+                    except PermissionError:
+                        # 无权修改属主时改为原地覆盖写入，保留原文件属主
+                        shutil.copyfile(tmp.name, path)
+                        os.unlink(tmp.name)
+                        return
+            os.replace(tmp.name, path)
+        except BaseException:
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+            raise
+
     def write_config(self, config_data: Dict[str, Any], config_file: str = None) -> bool:
         """写入PostgreSQL配置文件"""
         if not config_file:
             config_file = self.config_files[0] if self.config_files else None
 
         if not config_file:
-            print("未找到配置文件路径")
+            logger.warning("未找到配置文件路径")
             return False
 
         try:
@@ -229,49 +459,18 @@ class PostgreSQLConfigManager:
             backup_file = config_file + '.backup'
             if os.path.exists(config_file):
                 shutil.copy2(config_file, backup_file)
-                print(f"已备份原配置文件到: {backup_file}")
-
-            # 读取原文件，保留注释
-            lines = []
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
+                logger.info("已备份原配置文件到: %s", backup_file)
 
-            # 更新配置项
-            updated_lines = []
-            config_keys = set(config_data.keys())
+            # 逐行读取原文件写入临时文件，保留注释，完成后原子替换
+            self._replace_file(config_file,
+                               self._apply_updates(self._load_lines(config_file), config_data))
+            self._config_cache.pop(config_file, None)
 
-            for line in lines:
-                stripped = line.strip()
-                if not stripped or stripped.startswith('#'):
-                    updated_lines.append(line)
-                    continue
-
-                # 检查是否是需要更新的配置项
-                match = re.match(r'^\s*(\w+)\s*=', line)
-                if match and match.group(1) in config_keys:
-                    key = match.group(1)
-                    value = config_data[key]
-                    new_line = f"{key} = '{value}'\n"
-                    updated_lines.append(new_line)
-                    config_keys.remove(key)
-                else:
-                    updated_lines.append(line)
-
-            # 添加新的配置项
-            for key in config_keys:
-                value = config_data[key]
-                new_line = f"{key} = '{value}'\n"
-                updated_lines.append(new_line)
-
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
-
-            print(f"配置文件已更新: {config_file}")
+            logger.info("配置文件已更新: %s", config_file)
             return True
 
         except Exception as e:
-            print(f"写入配置文件失败: {e}")
+            logger.warning("写入配置文件失败: %s", e)
             return False
 
     def get_current_config(self) -> Dict[str, Any]:
@@ -298,12 +497,8 @@ class PostgreSQLConfigManager:
         config_data = self.read_config()
         if config_data:
             # 保存配置文件路径
-            if self.config_files:
-                for config_file in self.config_files:
-                    if 'postgresql.conf' in config_file:
-                        config_info['config_file'] = config_file
-                    elif 'pg_hba.conf' in config_file:
-                        config_info['hba_config_file'] = config_file
+            config_info['config_file'] = self._conf_path
+            config_info['hba_config_file'] = self._hba_path
 
             # 提取常用配置
             config_info['port'] = config_data.get('port', '5432')
@@ -318,21 +513,15 @@ class PostgreSQLConfigManager:
     def update_basic_config(self, port: int = 5432, max_connections: int = 100,
                            shared_buffers: str = '128MB') -> bool:
         """更新基本配置参数"""
-        config_data = self.read_config() or {}
-
-        # 更新配置
-        config_data.update({
+        # write_config 会保留文件中的其余配置，这里只需传入改动的项
+        return self.write_config({
             'port': str(port),
             'max_connections': str(max_connections),
             'shared_buffers': shared_buffers
         })
 
-        return self.write_config(config_data)
-
     def add_performance_config(self) -> bool:
         """添加性能优化配置"""
-        config_data = self.read_config() or {}
-
         # 性能优化配置
         performance_config = {
             # 内存设置
@@ -368,14 +557,10 @@ class PostgreSQLConfigManager:
             'autovacuum_naptime': '1min'
         }
 
-        config_data.update(performance_config)
-
-        return self.write_config(config_data)
+        return self.write_config(performance_config)
 
     def add_security_config(self) -> bool:
         """添加安全配置"""
-        config_data = self.read_config() or {}
-
         # 安全配置
         security_config = {
             # SSL设置
@@ -400,24 +585,37 @@ class PostgreSQLConfigManager:
             'zero_damaged_pages': 'off'
         }
 
-        config_data.update(security_config)
-
         # 更新HBA配置文件
         self._update_hba_security_config()
 
-        return self.write_config(config_data)
+        return self.write_config(security_config)
+
+    @staticmethod
+    def _secure_hba_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+        """将 local/host 规则中的 trust 认证改为 scram-sha-256，其余行原样输出"""
+        for line in lines:
+            stripped = line.strip()
+            # 注释、空行以及不含 trust 的行原样保留，不做拆分
+            if not stripped or stripped.startswith(b'#') or b'trust' not in stripped:
+                yield line
+                continue
+
+            parts = stripped.split()
+            if len(parts) < 5 or parts[4] != b'trust' or parts[0] not in (b'local', b'host'):
+                yield line
+                continue
+
+            eol = b'\r\n' if line.endswith(b'\r\n') else b'\n'
+            yield b' '.join(parts[:4] + [b'scram-sha-256'] + parts[5:]) + eol
 
     def _update_hba_security_config(self) -> bool:
         """更新HBA安全配置"""
         hba_file = self.default_paths.get('hba_config', '')
         if not hba_file or not os.path.exists(hba_file):
-            for config_file in self.config_files:
-                if 'pg_hba.conf' in config_file:
-                    hba_file = config_file
-                    break
+            hba_file = self._hba_path or hba_file
 
         if not hba_file or not os.path.exists(hba_file):
-            print("未找到pg_hba.conf文件")
+            logger.warning("未找到pg_hba.conf文件")
             return False
 
         try:
@@ -425,33 +623,15 @@ class PostgreSQLConfigManager:
             backup_file = hba_file + '.backup'
             shutil.copy2(hba_file, backup_file)
 
-            # 读取原配置
-            with open(hba_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # 更新配置，将trust改为md5或scram-sha-256
-            updated_lines = []
-            for line in lines:
-                stripped = line.strip()
-                if stripped and not stripped.startswith('#'):
-                    parts = stripped.split()
-                    if len(parts) >= 5:
-                        # 将本地连接的trust改为scram-sha-256
-                        if parts[0] in ['local', 'host'] and parts[4] == 'trust':
-                            parts[4] = 'scram-sha-256'
-                            line = ' '.join(parts) + '\n'
-
-                updated_lines.append(line)
-
-            # 写入更新后的配置
-            with open(hba_file, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
-
-            print("HBA安全配置已更新")
+            # 将trust改为scram-sha-256，写入临时文件后原子替换
+            self._replace_file(hba_file, self._secure_hba_lines(self._load_lines(hba_file)))
+            self._hba_cache.pop(hba_file, None)
+
+            logger.info("HBA安全配置已更新")
             return True
 
         except Exception as e:
-            print(f"更新HBA配置失败: {e}")
+            logger.warning("更新HBA配置失败: %s", e)
             return False
 
     def validate_config(self) -> Dict[str, Any]:
@@ -462,39 +642,42 @@ class PostgreSQLConfigManager:
             'warnings': []
         }
 
-        config_data = self.read_config()
-        if not config_data:
+        config_file = self.config_files[0] if self.config_files else None
+        config = None
+        if config_file and os.path.exists(config_file):
+            try:
+                config = _typed_config(config_file, os.stat(config_file).st_mtime_ns)
+            except Exception as e:
+                logger.warning("读取配置文件失败: %s", e)
+
+        if config is None or config.empty:
             result['valid'] = False
             result['errors'].append("无法读取配置文件")
             return result
 
         # 检查端口配置
-        port = config_data.get('port', '5432')
-        try:
-            port_int = int(port)
-            if port_int < 1 or port_int > 65535:
-                result['errors'].append(f"无效的端口号: {port}")
-                result['valid'] = False
-        except ValueError:
+        port = config.port
+        if config.port_int is None:
             result['errors'].append(f"端口号格式错误: {port}")
             result['valid'] = False
+        elif config.port_int < 1 or config.port_int > 65535:
+            result['errors'].append(f"无效的端口号: {port}")
+            result['valid'] = False
 
         # 检查连接数配置
-        max_connections = config_data.get('max_connections', '100')
-        try:
-            connections_int = int(max_connections)
-            if connections_int < 1 or connections_int > 8192:
-                result['warnings'].append(f"连接数可能不合理: {max_connections}")
-        except ValueError:
+        max_connections = config.max_connections
+        if config.max_connections_int is None:
             result['warnings'].append(f"连接数格式错误: {max_connections}")
+        elif config.max_connections_int < 1 or config.max_connections_int > 8192:
+            result['warnings'].append(f"连接数可能不合理: {max_connections}")
 
         # 检查数据目录
-        data_dir = config_data.get('data_directory', '')
+        data_dir = config.data_directory
         if data_dir and not os.path.exists(data_dir):
             result['warnings'].append(f"数据目录不存在: {data_dir}")
 
         # 检查内存配置
-        shared_buffers = config_data.get('shared_buffers', '128MB')
+        shared_buffers = config.shared_buffers
         if not self._validate_memory_size(shared_buffers):
             result['warnings'].append(f"shared_buffers格式可能不正确: {shared_buffers}")
 
@@ -505,17 +688,8 @@ class PostgreSQLConfigManager:
         if not size_str:
             return False
 
-        # 检查是否以数字开头
-        if not size_str[0].isdigit():
-            return False
-
-        # 检查单位
-        valid_units = ['B', 'kB', 'MB', 'GB', 'TB']
-        for unit in valid_units:
-            if size_str.endswith(unit):
-                return True
-
-        return False
+        # 数字 + 单位 (B/kB/MB/GB/TB)
+        return _MEM_RE.match(size_str) is not None
 
     def get_config_summary(self) -> str:
         """获取配置摘要"""
@@ -558,6 +732,9 @@ def main():
 
     args = parser.parse_args()
 
+    # 命令行下将库内日志直接输出到终端
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     config_manager = PostgreSQLConfigManager()
 
     if args.show:
@@ -7,28 +7,126 @@ PostgreSQL 安装和服务管理脚本
 
 import os
 import sys
+import ctypes
 import time
 import shutil
 import subprocess
 import platform
+import select
+import socket
+import threading
 import requests
 import tempfile
 import zipfile
 import tarfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple, Any
 
+try:
+    from ..common.file_utils import parallel_rmtree
+except ImportError:
+    # 作为独立脚本运行时没有上级包，将项目根目录加入搜索路径
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from app.manager.common.file_utils import parallel_rmtree
+
+# 下载安装包时的读写块大小
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# 下载中断后最多尝试的次数（每次从已下载的位置续传）
+_DOWNLOAD_ATTEMPTS = 3
+# 安装要求检查结果的缓存时间（秒）
+_REQUIREMENTS_TTL = 30
+# systemd ActiveState 到服务状态的映射
+_SYSTEMD_STATE_MAP = {
+    "active": "running",
+    "reloading": "running",
+    "activating": "starting",
+    "deactivating": "stopping",
+    "inactive": "stopped",
+    "failed": "stopped",
+}
+
+
+# Windows 服务状态 (SERVICE_STATUS.dwCurrentState) 到服务状态的映射
+_WIN_SERVICE_STATE_MAP = {
+    1: "stopped",     # SERVICE_STOPPED
+    2: "starting",    # SERVICE_START_PENDING
+    3: "stopping",    # SERVICE_STOP_PENDING
+    4: "running",     # SERVICE_RUNNING
+    5: "resuming",    # SERVICE_CONTINUE_PENDING
+    6: "pausing",     # SERVICE_PAUSE_PENDING
+    7: "paused",      # SERVICE_PAUSED
+}
+
+
+class _ServiceStatusProcess(ctypes.Structure):
+    """advapi32 SERVICE_STATUS_PROCESS 结构"""
+    _fields_ = [
+        ("dwServiceType", ctypes.c_uint32),
+        ("dwCurrentState", ctypes.c_uint32),
+        ("dwControlsAccepted", ctypes.c_uint32),
+        ("dwWin32ExitCode", ctypes.c_uint32),
+        ("dwServiceSpecificExitCode", ctypes.c_uint32),
+        ("dwCheckPoint", ctypes.c_uint32),
+        ("dwWaitHint", ctypes.c_uint32),
+        ("dwProcessId", ctypes.c_uint32),
+        ("dwServiceFlags", ctypes.c_uint32),
+    ]
+
 
 class PostgreSQLInstaller:
     """PostgreSQL 安装器和服务管理器"""
 
+    # shutil.which 查询结果，PATH 在进程运行期间视为不变
+    _which_cache: Dict[str, Optional[str]] = {}
+
     def __init__(self):
         """初始化安装器"""
         self.system = platform.system().lower()
         self.architecture = platform.machine().lower()
         self.postgresql_version = "16.1"
         self.installation_path = self._get_default_installation_path()
+        # 常用路径在初始化时计算一次
+        self._data_dir = os.path.join(self.installation_path, "data")
+        self._pg_ctl_path = self._tool_path("pg_ctl")
+        self._psql_path = self._tool_path("psql")
+        self._initdb_path = self._tool_path("initdb")
+        self._createuser_path = self._tool_path("createuser")
         self.service_name = "postgresql-x64-16" if self.system == "windows" else "postgresql"
+        self._session = None
+        self._init_system_name: Optional[str] = None
+        self._cached_version: Optional[str] = None
+        # check_requirements 结果缓存: (时间戳, 结果)
+        self._req_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+
+    @property
+    def _http(self) -> requests.Session:
+        """首次使用时创建的HTTP会话"""
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """创建复用连接的HTTP会话，下载失败时按配置自动重试"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                              respect_retry_after_header=True)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _tool_path(self, name: str) -> str:
+        """PostgreSQL 命令行工具路径: Windows 下为安装目录 bin 中的 exe，其它系统从 PATH 查找"""
+        if self.system == "windows":
+            return os.path.join(self.installation_path, "bin", name + ".exe")
+        return name
 
     def _get_default_installation_path(self) -> str:
         """获取默认安装路径"""
@@ -38,43 +136,72 @@ class PostgreSQLInstaller:
             return "/usr/local/pgsql"
 
     def check_requirements(self) -> Dict[str, bool]:
-        """检查安装要求"""
-        requirements = {
-            'internet': self._check_internet_connection(),
-            'disk_space': self._check_disk_space(500),  # 500MB
-            'admin_privileges': self._check_admin_privileges(),
+        """检查安装要求
+
+        三项检查互不依赖，并行执行；结果缓存 _REQUIREMENTS_TTL 秒，
+        避免同一流程中重复探测网络。
+        """
+        if self._req_cache and time.monotonic() - self._req_cache[0] < _REQUIREMENTS_TTL:
+            return dict(self._req_cache[1])
+
+        checks = {
+            'internet': self._check_internet_connection,
+            'disk_space': lambda: self._check_disk_space(500),  # 500MB
+            'admin_privileges': self._check_admin_privileges,
         }
+        requirements = {}
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {executor.submit(check): name for name, check in checks.items()}
+            for future in as_completed(futures):
+                requirements[futures[future]] = future.result()
 
-        return requirements
+        # 保持原有的键顺序
+        requirements = {name: requirements[name] for name in checks}
+        self._req_cache = (time.monotonic(), requirements)
+        return dict(requirements)
 
     def _check_internet_connection(self) -> bool:
-        """检查网络连接"""
+        """检查网络连接
+
+        只需确认能连通，TCP 握手成功即可，不必完成 TLS 握手和 HTTP 请求。
+        """
         try:
-            response = requests.get("https://www.postgresql.org", timeout=5)
-            return response.status_code == 200
-        except:
+            socket.create_connection(("www.postgresql.org", 443), timeout=2).close()
+            return True
+        except OSError:
             return False
 
     def _check_disk_space(self, required_mb: int) -> bool:
         """检查磁盘空间"""
         try:
-            if self.system == "windows":
-                import psutil
-                disk_usage = psutil.disk_usage("C:\\")
-                free_space_mb = disk_usage.free / (1024 * 1024)
-            else:
-                stat = os.statvfs("/")
-                free_space_mb = (stat.f_bavail * stat.f_frsize) / (1024 * 1024)
-
-            return free_space_mb >= required_mb
+            return self._free_space_mb() >= required_mb
         except:
             return True  # 假设有足够空间
 
+    def _free_space_mb(self) -> float:
+        """安装目标所在文件系统中当前用户可用的空间（MB），结果随 check_requirements 缓存"""
+        # 安装目录尚未创建时，检查最近的已存在上级目录
+        target = self.installation_path
+        while not os.path.exists(target) and os.path.dirname(target) != target:
+            target = os.path.dirname(target)
+
+        if self.system == "windows":
+            # 直接调用 GetDiskFreeSpaceExW，无需导入 psutil
+            free_bytes = ctypes.c_ulonglong()
+            if not ctypes.windll.kernel32.GetDiskFreeSpaceExW(
+                    ctypes.c_wchar_p(target), ctypes.byref(free_bytes), None, None):
+                raise ctypes.WinError()
+            free = free_bytes.value
+        else:
+            stat_result = os.statvfs(target)
+            free = stat_result.f_bavail * stat_result.f_frsize
+
+        return free / (1024 * 1024)
+
     def _check_admin_privileges(self) -> bool:
         """检查管理员权限"""
         if self.system == "windows":
             try:
-                import ctypes
                 return ctypes.windll.shell32.IsUserAnAdmin() != 0
             except:
                 return False
@@ -99,27 +226,62 @@ class PostgreSQLInstaller:
         # PostgreSQL 16 Windows x64 安装包下载链接
         download_url = "https://get.enterprisedb.com/postgresql/postgresql-16.1-1-windows-x64.exe"
 
-        try:
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
+        # 保存到临时目录，下载过程中写入 .part 文件，完成后再改名
+        temp_dir = tempfile.gettempdir()
+        filename = "postgresql-16.1-1-windows-x64.exe"
+        filepath = os.path.join(temp_dir, filename)
+        part_path = filepath + ".part"
+
+        print(f"正在下载到: {filepath}")
+        for attempt in range(1, _DOWNLOAD_ATTEMPTS + 1):
+            try:
+                if self._download_to_part(download_url, part_path):
+                    os.replace(part_path, filepath)
+                    print("下载完成")
+                    return filepath
+                print("下载的文件大小与服务器不一致，继续下载")
+            except Exception as e:
+                print(f"下载中断 ({attempt}/{_DOWNLOAD_ATTEMPTS}): {e}")
+
+        print("下载失败")
+        return None
 
-            # 保存到临时目录
-            temp_dir = tempfile.gettempdir()
-            filename = "postgresql-16.1-1-windows-x64.exe"
-            filepath = os.path.join(temp_dir, filename)
+    def _download_to_part(self, url: str, part_path: str) -> bool:
+        """下载到 .part 文件，已有部分内容时通过 Range 请求续传
+
+        Returns:
+            文件大小是否与服务器给出的总大小一致
+        """
+        existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # 不接受压缩编码，保证 Content-Length 即安装包实际大小
+        headers = {'Accept-Encoding': 'identity'}
+        if existing:
+            headers['Range'] = f'bytes={existing}-'
+
+        with self._http.get(url, stream=True, headers=headers, timeout=(10, 60)) as response:
+            if response.status_code == 416:
+                # 续传位置超出文件大小，.part 已失效，下次从头下载
+                os.unlink(part_path)
+                return False
+            response.raise_for_status()
 
-            print(f"正在下载到: {filepath}")
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            if response.status_code == 206:
+                # Content-Range: bytes <起始>-<结束>/<总大小>
+                total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                mode = 'ab'
+                print(f"从 {existing // (1024 * 1024)}MB 处继续下载")
+            else:
+                # 服务器不支持续传，从头开始
+                total = response.headers.get('Content-Length', '')
+                mode = 'wb'
 
-            print("下载完成")
-            return filepath
+            # 安装包约 300MB，直接从底层连接按 1MB 分块复制到文件，
+            # 复制循环在 shutil 内完成，不经过 iter_content 的逐块生成器
+            response.raw.decode_content = True
+            with open(part_path, mode, buffering=_DOWNLOAD_CHUNK_SIZE) as f:
+                shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_CHUNK_SIZE)
 
-        except Exception as e:
-            print(f"下载失败: {e}")
-            return None
+        return not total.isdigit() or os.path.getsize(part_path) == int(total)
 
     def _download_postgresql_linux(self) -> Optional[str]:
         """下载Linux版PostgreSQL"""
@@ -151,6 +313,7 @@ class PostgreSQLInstaller:
 
     def install_postgresql(self, installer_path: str = None) -> bool:
         """安装PostgreSQL"""
+        self._cached_version = None
         try:
             if self.system == "windows":
                 return self._install_postgresql_windows(installer_path)
@@ -179,7 +342,7 @@ class PostgreSQLInstaller:
                 installer_path,
                 "--mode", "unattended",
                 "--prefix", self.installation_path,
-                "--datadir", os.path.join(self.installation_path, "data"),
+                "--datadir", self._data_dir,
                 "--superpassword", "postgres",
                 "--servicename", self.service_name,
                 "--serviceaccount", "NT AUTHORITY\\NetworkService",
@@ -187,19 +350,61 @@ class PostgreSQLInstaller:
             ]
 
             print("正在运行安装程序...")
-            result = subprocess.run(install_cmd, capture_output=True, text=True)
+            returncode, _, stderr = self._run_polling(install_cmd)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 print("PostgreSQL安装成功")
                 return True
             else:
-                print(f"安装失败: {result.stderr}")
+                print(f"安装失败: {stderr}")
                 return False
 
         except Exception as e:
             print(f"安装过程中出错: {e}")
             return False
 
+    @staticmethod
+    def _run_polling(cmd: List[str], poll_interval: float = 0.1) -> Tuple[int, str, str]:
+        """运行耗时命令，后台线程读取输出，主线程定期轮询进程状态
+
+        与 subprocess.run 不同，等待期间主线程每隔 poll_interval 秒醒来一次，
+        Ctrl-C 等信号能及时响应；标准输出逐行打印，便于观察安装进度。
+
+        Returns:
+            (退出码, 标准输出, 标准错误)
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, bufsize=1)
+        stdout_lines: List[str] = []
+        stderr_lines: List[str] = []
+
+        def drain(pipe, lines, echo):
+            with pipe:
+                for line in pipe:
+                    lines.append(line)
+                    if echo and line.strip():
+                        print(line.rstrip())
+
+        readers = [
+            threading.Thread(target=drain, args=(proc.stdout, stdout_lines, True), daemon=True),
+            threading.Thread(target=drain, args=(proc.stderr, stderr_lines, False), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            while proc.poll() is None:
+                time.sleep(poll_interval)
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+
+        return proc.returncode, "".join(stdout_lines), "".join(stderr_lines)
+
     def _install_postgresql_linux(self) -> bool:
         """安装Linux版PostgreSQL"""
         print("请使用系统包管理器安装PostgreSQL")
@@ -212,6 +417,7 @@ class PostgreSQLInstaller:
 
     def uninstall_postgresql(self) -> bool:
         """卸载PostgreSQL"""
+        self._cached_version = None
         try:
             if self.system == "windows":
                 return self._uninstall_postgresql_windows()
@@ -232,7 +438,7 @@ class PostgreSQLInstaller:
         # 删除安装目录
         if os.path.exists(self.installation_path):
             try:
-                shutil.rmtree(self.installation_path)
+                parallel_rmtree(self.installation_path)
                 print(f"已删除安装目录: {self.installation_path}")
             except Exception as e:
                 print(f"删除安装目录失败: {e}")
@@ -267,8 +473,8 @@ class PostgreSQLInstaller:
         """安装Windows服务"""
         print("正在安装PostgreSQL服务...")
 
-        pg_ctl_path = os.path.join(self.installation_path, "bin", "pg_ctl.exe")
-        data_dir = os.path.join(self.installation_path, "data")
+        pg_ctl_path = self._pg_ctl_path
+        data_dir = self._data_dir
 
         if not os.path.exists(pg_ctl_path):
             print("未找到pg_ctl.exe")
@@ -283,12 +489,12 @@ class PostgreSQLInstaller:
                 "-D", data_dir
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            returncode, _, stderr = self._run_polling(cmd)
+            if returncode == 0:
                 print(f"服务 {self.service_name} 注册成功")
                 return True
             else:
-                print(f"服务注册失败: {result.stderr}")
+                print(f"服务注册失败: {stderr}")
                 return False
 
         except Exception as e:
@@ -316,8 +522,8 @@ class PostgreSQLInstaller:
             return True
         else:
             # 尝试使用pg_ctl启动
-            pg_ctl_path = os.path.join(self.installation_path, "bin", "pg_ctl.exe")
-            data_dir = os.path.join(self.installation_path, "data")
+            pg_ctl_path = self._pg_ctl_path
+            data_dir = self._data_dir
 
             if os.path.exists(pg_ctl_path):
                 cmd = [pg_ctl_path, "start", "-D", data_dir]
@@ -329,19 +535,39 @@ class PostgreSQLInstaller:
             print(f"启动服务失败: {result.stderr}")
             return False
 
+    @classmethod
+    def _which(cls, name: str) -> Optional[str]:
+        """带缓存的 shutil.which"""
+        if name not in cls._which_cache:
+            cls._which_cache[name] = shutil.which(name)
+        return cls._which_cache[name]
+
+    @property
+    def _init_system(self) -> str:
+        """当前系统的服务管理方式，首次访问时检测: systemd / sysvinit / service"""
+        if self._init_system_name is None:
+            if self._which("systemctl") and os.path.isdir("/run/systemd/system"):
+                self._init_system_name = "systemd"
+            elif os.path.exists("/etc/init.d/postgresql"):
+                self._init_system_name = "sysvinit"
+            else:
+                self._init_system_name = "service"
+        return self._init_system_name
+
+    def _unix_service_cmd(self, action: str) -> List[str]:
+        """按服务管理方式生成服务操作命令"""
+        if self._init_system == "systemd":
+            return ["sudo", "systemctl", action, "postgresql"]
+        if self._init_system == "sysvinit":
+            return ["sudo", "/etc/init.d/postgresql", action]
+        return ["sudo", "service", "postgresql", action]
+
     def _start_service_unix(self) -> bool:
         """启动Unix服务"""
-        commands = [
-            ["sudo", "systemctl", "start", "postgresql"],
-            ["sudo", "service", "postgresql", "start"],
-            ["sudo", "/etc/init.d/postgresql", "start"]
-        ]
-
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("PostgreSQL服务启动成功")
-                return True
+        result = subprocess.run(self._unix_service_cmd("start"), capture_output=True, text=True)
+        if result.returncode == 0:
+            print("PostgreSQL服务启动成功")
+            return True
 
         print("启动服务失败")
         return False
@@ -367,8 +593,8 @@ class PostgreSQLInstaller:
             return True
         else:
             # 尝试使用pg_ctl停止
-            pg_ctl_path = os.path.join(self.installation_path, "bin", "pg_ctl.exe")
-            data_dir = os.path.join(self.installation_path, "data")
+            pg_ctl_path = self._pg_ctl_path
+            data_dir = self._data_dir
 
             if os.path.exists(pg_ctl_path):
                 cmd = [pg_ctl_path, "stop", "-D", data_dir]
@@ -382,17 +608,10 @@ class PostgreSQLInstaller:
 
     def _stop_service_unix(self) -> bool:
         """停止Unix服务"""
-        commands = [
-            ["sudo", "systemctl", "stop", "postgresql"],
-            ["sudo", "service", "postgresql", "stop"],
-            ["sudo", "/etc/init.d/postgresql", "stop"]
-        ]
-
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("PostgreSQL服务停止成功")
-                return True
+        result = subprocess.run(self._unix_service_cmd("stop"), capture_output=True, text=True)
+        if result.returncode == 0:
+            print("PostgreSQL服务停止成功")
+            return True
 
         print("停止服务失败")
         return False
@@ -400,11 +619,141 @@ class PostgreSQLInstaller:
     def restart_service(self) -> bool:
         """重启PostgreSQL服务"""
         print("正在重启PostgreSQL服务...")
+        # 停止后主进程信息不再可得，需在停止前读取
+        pid = self._postmaster_pid()
         if self.stop_service():
-            time.sleep(2)
+            if pid is None:
+                # 无法得知主进程，按原方式等待
+                time.sleep(2)
+            elif not self._wait_for_pid_exit(pid, timeout=30):
+                print(f"等待PostgreSQL主进程 {pid} 退出超时")
             return self.start_service()
         return False
 
+    def _postmaster_pid(self) -> Optional[int]:
+        """获取 PostgreSQL 主进程 PID
+
+        systemd 下由 systemctl 给出服务主进程，包管理器安装的数据目录不在
+        installation_path 下；其它情况读取数据目录下的 postmaster.pid。
+        """
+        if self.system != "windows" and self._init_system == "systemd":
+            pid = self._systemd_main_pid()
+            if pid is not None:
+                return pid
+        return self._read_postmaster_pid()
+
+    @staticmethod
+    def _systemd_main_pid() -> Optional[int]:
+        """读取 systemd 服务的 MainPID
+
+        Debian/Ubuntu 的 postgresql.service 是无主进程的包装单元（MainPID=0），
+        此时取 postgresql@<版本>-<集群> 实例单元中第一个运行中的主进程。
+        """
+        for unit in ("postgresql", "postgresql@*"):
+            result = subprocess.run(
+                ["systemctl", "show", "-p", "MainPID", "--value", unit],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                continue
+            pids = [int(value) for value in result.stdout.split() if value.isdigit() and int(value) > 0]
+            if pids:
+                return pids[0]
+        return None
+
+    def _read_postmaster_pid(self) -> Optional[int]:
+        """读取数据目录下 postmaster.pid 第一行的主进程 PID"""
+        pid_file = os.path.join(self._data_dir, "postmaster.pid")
+        try:
+            with open(pid_file, 'r', encoding='utf-8') as f:
+                return int(f.readline().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _wait_for_pid_exit(self, pid: int, timeout: float) -> bool:
+        """等待进程退出，进程退出时立即返回
+
+        Linux 使用 pidfd，macOS/BSD 使用 kqueue，Windows 使用进程句柄，
+        均由内核在进程退出时通知；其它平台每 0.1 秒检查一次。
+
+        Returns:
+            进程是否已退出
+        """
+        try:
+            if hasattr(os, "pidfd_open"):
+                return self._wait_pidfd(pid, timeout)
+            if hasattr(select, "kqueue"):
+                return self._wait_kqueue(pid, timeout)
+            if self.system == "windows":
+                return self._wait_process_handle(pid, timeout)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # 无权限等情况下退回轮询
+            pass
+        return self._wait_polling(pid, timeout)
+
+    @staticmethod
+    def _wait_pidfd(pid: int, timeout: float) -> bool:
+        """Linux: pidfd 在进程退出时变为可读"""
+        fd = os.pidfd_open(pid)
+        try:
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            return bool(poller.poll(timeout * 1000))
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _wait_kqueue(pid: int, timeout: float) -> bool:
+        """macOS/BSD: 通过 EVFILT_PROC/NOTE_EXIT 等待进程退出"""
+        kq = select.kqueue()
+        try:
+            event = select.kevent(pid, filter=select.KQ_FILTER_PROC,
+                                  flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                                  fflags=select.KQ_NOTE_EXIT)
+            return bool(kq.control([event], 1, timeout))
+        finally:
+            kq.close()
+
+    @staticmethod
+    def _wait_process_handle(pid: int, timeout: float) -> bool:
+        """Windows: 等待进程句柄变为有信号状态"""
+        SYNCHRONIZE = 0x00100000
+        WAIT_OBJECT_0 = 0
+        ERROR_INVALID_PARAMETER = 87
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            if ctypes.get_last_error() == ERROR_INVALID_PARAMETER:
+                # 进程已不存在
+                raise ProcessLookupError(pid)
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            return kernel32.WaitForSingleObject(handle, int(timeout * 1000)) == WAIT_OBJECT_0
+        finally:
+            kernel32.CloseHandle(handle)
+
+    @staticmethod
+    def _wait_polling(pid: int, timeout: float) -> bool:
+        """通用方案: 每 0.1 秒用信号 0 检查进程是否存在（不适用于 Windows）"""
+        if sys.platform == "win32":
+            # Windows 上 os.kill 会直接结束进程，不能用来探测
+            time.sleep(2)
+            return True
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                # 进程存在但属于其它用户
+                pass
+            time.sleep(0.1)
+        return False
+
     def get_service_status(self) -> Dict[str, Any]:
         """获取服务状态"""
         try:
@@ -416,63 +765,131 @@ class PostgreSQLInstaller:
             return {"status": "error", "message": str(e)}
 
     def _get_service_status_windows(self) -> Dict[str, Any]:
-        """获取Windows服务状态"""
+        """获取Windows服务状态，优先使用 pywin32，未安装时直接调用 advapi32"""
         try:
             import win32service
             import win32con
+        except ImportError:
+            return self._get_service_status_advapi()
 
+        try:
             scm = win32service.OpenSCManager(None, None, win32con.GENERIC_READ)
-            service = win32service.OpenService(scm, self.service_name, win32con.GENERIC_READ)
-            status = win32service.QueryServiceStatus(service)
-
-            status_map = {
-                win32service.SERVICE_STOPPED: "stopped",
-                win32service.SERVICE_START_PENDING: "starting",
-                win32service.SERVICE_STOP_PENDING: "stopping",
-                win32service.SERVICE_RUNNING: "running",
-                win32service.SERVICE_CONTINUE_PENDING: "resuming",
-                win32service.SERVICE_PAUSE_PENDING: "pausing",
-                win32service.SERVICE_PAUSED: "paused"
-            }
+            try:
+                service = win32service.OpenService(scm, self.service_name, win32con.GENERIC_READ)
+                try:
+                    status = win32service.QueryServiceStatus(service)
+                finally:
+                    win32service.CloseServiceHandle(service)
+            finally:
+                win32service.CloseServiceHandle(scm)
 
             return {
-                "status": status_map.get(status[1], "unknown"),
+                "status": _WIN_SERVICE_STATE_MAP.get(status[1], "unknown"),
                 "service_name": self.service_name
             }
 
-        except ImportError:
-            # 使用sc命令作为备选方案
-            cmd = ["sc", "query", self.service_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if "RUNNING" in result.stdout:
-                return {"status": "running", "service_name": self.service_name}
-            elif "STOPPED" in result.stdout:
-                return {"status": "stopped", "service_name": self.service_name}
-            else:
-                return {"status": "unknown", "message": result.stderr}
-
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _get_service_status_advapi(self) -> Dict[str, Any]:
+        """通过 ctypes 调用 QueryServiceStatusEx，不启动 sc 进程，也不依赖系统语言"""
+
+        SC_MANAGER_CONNECT = 0x0001
+        SERVICE_QUERY_STATUS = 0x0004
+        SC_STATUS_PROCESS_INFO = 0
+
+        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+        advapi32.OpenSCManagerW.restype = ctypes.c_void_p
+        advapi32.OpenServiceW.restype = ctypes.c_void_p
+        advapi32.OpenServiceW.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_uint32]
+        advapi32.QueryServiceStatusEx.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_uint32,
+            ctypes.POINTER(ctypes.c_uint32)
+        ]
+        advapi32.CloseServiceHandle.argtypes = [ctypes.c_void_p]
+
+        scm = advapi32.OpenSCManagerW(None, None, SC_MANAGER_CONNECT)
+        if not scm:
+            return {"status": "error", "message": str(ctypes.WinError(ctypes.get_last_error()))}
+        try:
+            service = advapi32.OpenServiceW(scm, self.service_name, SERVICE_QUERY_STATUS)
+            if not service:
+                return {"status": "error", "message": str(ctypes.WinError(ctypes.get_last_error()))}
+            try:
+                status = _ServiceStatusProcess()
+                needed = ctypes.c_uint32()
+                if not advapi32.QueryServiceStatusEx(service, SC_STATUS_PROCESS_INFO,
+                                                     ctypes.byref(status), ctypes.sizeof(status),
+                                                     ctypes.byref(needed)):
+                    return {"status": "error", "message": str(ctypes.WinError(ctypes.get_last_error()))}
+            finally:
+                advapi32.CloseServiceHandle(service)
+        finally:
+            advapi32.CloseServiceHandle(scm)
+
+        return {
+            "status": _WIN_SERVICE_STATE_MAP.get(status.dwCurrentState, "unknown"),
+            "service_name": self.service_name,
+            "pid": status.dwProcessId
+        }
+
     def _get_service_status_unix(self) -> Dict[str, Any]:
         """获取Unix服务状态"""
-        commands = [
-            ["sudo", "systemctl", "status", "postgresql"],
-            ["sudo", "service", "postgresql", "status"],
-            ["sudo", "/etc/init.d/postgresql", "status"]
-        ]
+        if self._init_system == "systemd":
+            return self._get_service_status_systemd()
 
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode in [0, 3]:  # 0=running, 3=stopped
-                if "active (running)" in result.stdout:
-                    return {"status": "running"}
-                elif "inactive (dead)" in result.stdout or "stopped" in result.stdout:
-                    return {"status": "stopped"}
+        result = subprocess.run(self._unix_service_cmd("status"), capture_output=True, text=True)
+        if result.returncode in [0, 3]:  # 0=running, 3=stopped
+            if "active (running)" in result.stdout:
+                return {"status": "running"}
+            elif "inactive (dead)" in result.stdout or "stopped" in result.stdout:
+                return {"status": "stopped"}
 
         return {"status": "unknown"}
 
+    def _get_service_status_systemd(self) -> Dict[str, Any]:
+        """通过 systemctl show 读取 ActiveState/SubState，无需 sudo，也不输出日志
+
+        Debian/Ubuntu 的 postgresql.service 是 oneshot 包装单元，集群停止后仍为
+        active/exited，此时以 postgresql@<版本>-<集群> 实例单元的状态为准。
+        """
+        units = self._systemd_unit_states("postgresql")
+        if not units:
+            return {"status": "unknown"}
+
+        active_state, sub_state = units[0]
+        if (active_state, sub_state) == ("active", "exited"):
+            instances = self._systemd_unit_states("postgresql@*")
+            if not instances:
+                return {"status": "stopped", "active_state": active_state, "sub_state": sub_state}
+            # 任一集群在运行即视为运行中
+            active_state, sub_state = next(
+                (state for state in instances if state == ("active", "running")), instances[0]
+            )
+
+        status = _SYSTEMD_STATE_MAP.get(active_state, "unknown")
+        if active_state == "active" and sub_state not in ("running", "reload"):
+            status = "stopped"
+        return {"status": status, "active_state": active_state, "sub_state": sub_state}
+
+    @staticmethod
+    def _systemd_unit_states(unit: str) -> List[Tuple[str, str]]:
+        """返回匹配单元的 (ActiveState, SubState) 列表，unit 可为通配符模式"""
+        result = subprocess.run(
+            ["systemctl", "show", "-p", "ActiveState", "-p", "SubState", unit],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return []
+
+        # 多个单元的属性块之间以空行分隔
+        states = []
+        for block in result.stdout.strip().split("\n\n"):
+            props = dict(line.split("=", 1) for line in block.splitlines() if "=" in line)
+            if props.get("ActiveState"):
+                states.append((props["ActiveState"], props.get("SubState", "")))
+        return states
+
     def service_exists(self) -> bool:
         """检查服务是否存在"""
         status = self.get_service_status()
@@ -483,31 +900,30 @@ class PostgreSQLInstaller:
         if self.system == "windows":
             return os.path.exists(self.installation_path)
         else:
-            # 检查psql命令是否存在
-            try:
-                subprocess.run(["psql", "--version"],
-                             capture_output=True, check=True)
-                return True
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                return False
+            # 检查psql命令是否存在，只查找 PATH，无需启动进程
+            return shutil.which("psql") is not None
 
     def get_postgresql_version(self) -> Optional[str]:
-        """获取PostgreSQL版本"""
+        """获取PostgreSQL版本
+
+        已安装的程序在运行期间不会变化，取得版本后缓存在实例上，
+        安装或卸载时清除。
+        """
+        if self._cached_version is None:
+            self._cached_version = self._query_postgresql_version()
+        return self._cached_version
+
+    def _query_postgresql_version(self) -> Optional[str]:
+        """运行 psql --version 读取版本号"""
         try:
-            if self.system == "windows":
-                psql_path = os.path.join(self.installation_path, "bin", "psql.exe")
-                if os.path.exists(psql_path):
-                    result = subprocess.run([psql_path, "--version"],
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        # 提取版本号: psql (PostgreSQL) 16.1
-                        return result.stdout.split()[-1]
-            else:
-                result = subprocess.run(["psql", "--version"],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    # 提取版本号
-                    return result.stdout.split()[-1]
+            if self.system == "windows" and not os.path.exists(self._psql_path):
+                return None
+
+            result = subprocess.run([self._psql_path, "--version"],
+                                    capture_output=True, text=True)
+            if result.returncode == 0:
+                # 提取版本号: psql (PostgreSQL) 16.1
+                return result.stdout.rpartition(' ')[2].strip() or None
         except:
             pass
 
@@ -517,12 +933,9 @@ class PostgreSQLInstaller:
         """初始化数据库"""
         try:
             if not data_dir:
-                data_dir = os.path.join(self.installation_path, "data")
+                data_dir = self._data_dir
 
-            if self.system == "windows":
-                initdb_path = os.path.join(self.installation_path, "bin", "initdb.exe")
-            else:
-                initdb_path = "initdb"
+            initdb_path = self._initdb_path
 
             if not os.path.exists(initdb_path) and self.system != "windows":
                 initdb_path = "/usr/lib/postgresql/16/bin/initdb"
@@ -544,12 +957,8 @@ class PostgreSQLInstaller:
     def create_user(self, username: str, password: str = None) -> bool:
         """创建数据库用户"""
         try:
-            if self.system == "windows":
-                createuser_path = os.path.join(self.installation_path, "bin", "createuser.exe")
-                psql_path = os.path.join(self.installation_path, "bin", "psql.exe")
-            else:
-                createuser_path = "createuser"
-                psql_path = "psql"
+            createuser_path = self._createuser_path
+            psql_path = self._psql_path
 
             # 创建用户
             cmd = [createuser_path, "-U", "postgres", username]